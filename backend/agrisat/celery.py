@@ -25,7 +25,7 @@ app.conf.beat_schedule = {
         'schedule': 86400.0,  # Run daily
     },
     'check-fire-alerts': {
-        'task': 'apps.disasters.tasks.check_fire_alerts',
+        'task': 'apps.disasters.tasks.check_fire_alerts_for_all_fields',
         'schedule': 1800.0,  # Run every 30 minutes
     },
     'cleanup-old-data': {
@@ -36,6 +36,9 @@ app.conf.beat_schedule = {
 
 app.conf.timezone = 'UTC'
 
+# Rebuild the beat heap only when the schedule actually changes
+app.conf.beat_scheduler = 'agrisat.scheduler:InvalidationScheduler'
+
 @app.task(bind=True)
 def debug_task(self):
     print(f'Request: {self.request!r}')
\ No newline at end of file
@@ -0,0 +1,18 @@
+"""
+Celery entrypoint for the I/O-bound ``disasters`` queue.
+
+Run with the gevent pool, e.g.::
+
+    celery -A agrisat.gevent_worker worker -Q disasters -P gevent -c 200
+
+Celery monkey-patches the standard library itself when ``-P gevent`` is
+given; psycopg2 additionally needs its wait callback made cooperative so
+that database calls yield to other greenlets.
+"""
+from psycogreen.gevent import patch_psycopg
+
+patch_psycopg()
+
+from .celery import app  # noqa: E402
+
+__all__ = ('app',)
@@ -0,0 +1,25 @@
+import orjson
+from rest_framework.renderers import JSONRenderer
+from rest_framework.utils.encoders import JSONEncoder
+
+_FALLBACK_ENCODER = JSONEncoder()
+
+
+class ORJSONRenderer(JSONRenderer):
+    """
+    JSONRenderer backed by orjson, which serializes UUIDs, datetimes and
+    numpy values natively. Anything orjson does not know (Decimal, lazy
+    translation strings, querysets, ...) goes through DRF's own encoder.
+    """
+    options = (
+        orjson.OPT_SERIALIZE_NUMPY |
+        orjson.OPT_NAIVE_UTC |
+        orjson.OPT_UTC_Z |
+        orjson.OPT_NON_STR_KEYS
+    )
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+
+        return orjson.dumps(data, default=_FALLBACK_ENCODER.default, option=self.options)
@@ -0,0 +1,43 @@
+from celery.beat import PersistentScheduler
+
+
+class InvalidationScheduler(PersistentScheduler):
+    """
+    Beat scheduler that only rebuilds its heap when the schedule is changed.
+
+    The stock scheduler compares every entry of the current schedule with a
+    copy taken on the previous tick, on every tick. This backports the
+    explicit invalidation approach of celery PR #10167: every mutation
+    (add / update_from_dict / merge_inplace / set_schedule) marks the heap as
+    stale and the per-tick comparison becomes a flag check. Schedule changes
+    must go through these methods for the heap to be rebuilt.
+    """
+
+    _heap_invalidated = True
+
+    def invalidate_heap(self):
+        self._heap_invalidated = True
+
+    def schedules_equal(self, old_schedules, new_schedules):
+        if self._heap_invalidated:
+            self._heap_invalidated = False
+            return False
+        return True
+
+    def add(self, **kwargs):
+        self.invalidate_heap()
+        return super().add(**kwargs)
+
+    def update_from_dict(self, dict_):
+        self.invalidate_heap()
+        super().update_from_dict(dict_)
+
+    def merge_inplace(self, b):
+        self.invalidate_heap()
+        super().merge_inplace(b)
+
+    def set_schedule(self, schedule):
+        self.invalidate_heap()
+        super().set_schedule(schedule)
+
+    schedule = property(PersistentScheduler.get_schedule, set_schedule)
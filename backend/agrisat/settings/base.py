@@ -94,12 +94,20 @@ CELERY_ACCEPT_CONTENT = ['json']
 CELERY_TASK_SERIALIZER = 'json'
 CELERY_RESULT_SERIALIZER = 'json'
 CELERY_TIMEZONE = 'UTC'
+CELERY_BROKER_POOL_LIMIT = 50
+
+# Fire monitoring is I/O-bound (FIRMS HTTP calls), so it gets its own queue
+# served by a gevent worker (see agrisat/gevent_worker.py); everything else
+# stays on the default prefork queue.
+CELERY_TASK_ROUTES = {
+    'apps.disasters.tasks.*': {'queue': 'disasters'},
+}
 
 # REST Framework
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': [
         'rest_framework.authentication.SessionAuthentication',
-        'rest_framework.authentication.TokenAuthentication',
+        'apps.authentication.auth.CachedTokenAuthentication',
     ],
     'DEFAULT_PERMISSION_CLASSES': [
         'rest_framework.permissions.IsAuthenticated',
@@ -110,8 +118,13 @@ REST_FRAMEWORK = {
     ],
     'DEFAULT_THROTTLE_RATES': {
         'anon': '100/hour',
-        'user': '1000/hour'
+        'user': '1000/hour',
+        'login': '20/minute'
     },
+    'DEFAULT_RENDERER_CLASSES': [
+        'agrisat.renderers.ORJSONRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',
+    ],
     'DEFAULT_SCHEMA_CLASS': 'drf_spectacular.openapi.AutoSchema',
     'DEFAULT_PAGINATION_CLASS': 'rest_framework.pagination.PageNumberPagination',
     'PAGE_SIZE': 20
@@ -152,6 +165,20 @@ AUTH_PASSWORD_VALIDATORS = [
     },
 ]
 
+# Password hashing - Argon2 first; existing PBKDF2 hashes keep working and
+# are upgraded to Argon2 on the next successful login
+PASSWORD_HASHERS = [
+    'django.contrib.auth.hashers.Argon2PasswordHasher',
+    'django.contrib.auth.hashers.PBKDF2PasswordHasher',
+    'django.contrib.auth.hashers.PBKDF2SHA1PasswordHasher',
+    'django.contrib.auth.hashers.ScryptPasswordHasher',
+]
+
+# Authentication backends
+AUTHENTICATION_BACKENDS = [
+    'apps.authentication.backends.EmailOrUsernameBackend',
+]
+
 # Internationalization
 LANGUAGE_CODE = 'en-us'
 TIME_ZONE = 'UTC'
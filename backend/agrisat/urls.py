@@ -1,26 +1,30 @@
+import json
 from django.contrib import admin
 from django.urls import path, include
 from django.conf import settings
 from django.conf.urls.static import static
-from django.http import JsonResponse
+from django.http import HttpResponse
 from rest_framework.documentation import include_docs_urls
 
+# The root payload is static, so it is serialized once at import time
+_API_ROOT_BYTES = json.dumps({
+    'message': 'Welcome to NASA AgriSat Intelligence Platform API',
+    'version': '1.0.0',
+    'endpoints': {
+        'admin': '/admin/',
+        'authentication': '/api/auth/',
+        'fields': '/api/fields/',
+        'weather': '/api/weather/',
+        'satellites': '/api/satellites/',
+        'disasters': '/api/disasters/',
+    },
+    'documentation': 'API documentation available at /docs/ (when enabled)',
+    'status': 'operational'
+}).encode()
+
 def api_root(request):
     """Root API endpoint with platform information"""
-    return JsonResponse({
-        'message': 'Welcome to NASA AgriSat Intelligence Platform API',
-        'version': '1.0.0',
-        'endpoints': {
-            'admin': '/admin/',
-            'authentication': '/api/auth/',
-            'fields': '/api/fields/',
-            'weather': '/api/weather/',
-            'satellites': '/api/satellites/',
-            'disasters': '/api/disasters/',
-        },
-        'documentation': 'API documentation available at /docs/ (when enabled)',
-        'status': 'operational'
-    })
+    return HttpResponse(_API_ROOT_BYTES, content_type='application/json')
 
 urlpatterns = [
     # Root API endpoint
@@ -3,4 +3,7 @@ from django.apps import AppConfig
 class AuthenticationConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'apps.authentication'
-    verbose_name = 'Authentication'
\ No newline at end of file
+    verbose_name = 'Authentication'
+    
+    def ready(self):
+        import apps.authentication.signals
\ No newline at end of file
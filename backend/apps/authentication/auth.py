@@ -0,0 +1,136 @@
+import hashlib
+import hmac
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.utils.translation import gettext_lazy as _
+from rest_framework import exceptions
+from rest_framework.authentication import TokenAuthentication
+
+TOKEN_CACHE_TIMEOUT = 300  # 5 minutes
+LOGIN_CACHE_TIMEOUT = 300  # 5 minutes
+
+
+def token_cache_key(key):
+    return f"tok:{key}"
+
+
+def cache_token(token, user):
+    """
+    Prime the authentication cache with a freshly issued token so the first
+    authenticated request skips the token lookup too.
+    """
+    cache.set(token_cache_key(token.key), (user.pk, user.is_active), timeout=TOKEN_CACHE_TIMEOUT)
+
+
+def invalidate_cached_token(key):
+    """
+    Drop a token from the authentication cache (on logout, password change, ...).
+    """
+    cache.delete(token_cache_key(key))
+
+
+def _credentials_digest(identifier, password):
+    """
+    Keyed HMAC of a set of credentials, so neither the raw password nor a
+    cheap unkeyed hash ends up in a cache key.
+    """
+    return hmac.new(
+        settings.SECRET_KEY.encode(),
+        f"{identifier}\x00{password}".encode(),
+        hashlib.sha256
+    ).hexdigest()
+
+
+def login_cache_key(identifier, password):
+    """
+    Cache key for a successful login.
+    """
+    return f"login:{_credentials_digest(identifier, password)}"
+
+
+def password_check_cache_key(user_id, password):
+    """
+    Cache key for a successful check_password() of a user.
+    """
+    return f"pw:{_credentials_digest(user_id, password)}"
+
+
+def get_cached_login(identifier, password):
+    """
+    Return the user of a recent successful login with the same credentials,
+    or None. The entry is only honoured while the user's password hash is
+    unchanged, so a password change invalidates it.
+    """
+    cached = cache.get(login_cache_key(identifier, password))
+    if cached is None:
+        return None
+
+    user_id, password_hash = cached
+    UserModel = get_user_model()
+    user = UserModel._default_manager.filter(pk=user_id).first()
+    if user is None or user.password != password_hash:
+        return None
+    return user
+
+
+def cache_login(identifier, password, user):
+    cache.set(
+        login_cache_key(identifier, password),
+        (user.pk, user.password),
+        timeout=LOGIN_CACHE_TIMEOUT
+    )
+
+
+def check_password_cached(user, password):
+    """
+    user.check_password() that remembers a successful verification for as
+    long as the stored password hash stays the same.
+    """
+    cache_key = password_check_cache_key(user.pk, password)
+    if cache.get(cache_key) == user.password:
+        return True
+
+    if not user.check_password(password):
+        return False
+
+    cache.set(cache_key, user.password, timeout=LOGIN_CACHE_TIMEOUT)
+    return True
+
+
+class CachedTokenAuthentication(TokenAuthentication):
+    """
+    Token authentication that caches which user a token belongs to, so
+    authenticated requests skip the token -> user join. Only (user_id,
+    is_active) is cached; the user itself is loaded by primary key on every
+    request, so request.user is never stale and no password hash is kept
+    in the cache.
+    """
+
+    def authenticate_credentials(self, key):
+        cache_key = token_cache_key(key)
+        cached = cache.get(cache_key)
+        model = self.get_model()
+
+        if cached is None:
+            try:
+                token = model.objects.select_related('user').get(key=key)
+            except model.DoesNotExist:
+                raise exceptions.AuthenticationFailed(_('Invalid token.'))
+            user = token.user
+            cache.set(cache_key, (user.pk, user.is_active), timeout=TOKEN_CACHE_TIMEOUT)
+        else:
+            user_id, is_active = cached
+            if not is_active:
+                raise exceptions.AuthenticationFailed(_('User inactive or deleted.'))
+            user = get_user_model()._default_manager.filter(pk=user_id).first()
+            if user is None:
+                invalidate_cached_token(key)
+                raise exceptions.AuthenticationFailed(_('User inactive or deleted.'))
+            token = model(key=key, user=user)
+
+        if not user.is_active:
+            raise exceptions.AuthenticationFailed(_('User inactive or deleted.'))
+
+        return (user, token)
\ No newline at end of file
@@ -0,0 +1,58 @@
+from django.db import migrations
+from django.db.models import Count
+from django.db.models.functions import Lower
+
+INDEX_NAME = 'auth_user_email_uniq'
+
+
+def check_duplicate_emails(apps, schema_editor):
+    """
+    Registration used to compare emails case-sensitively, so existing rows
+    can differ only in case. Stop with the conflicting addresses rather
+    than a bare index creation error; they have to be merged or changed
+    by hand before migrating.
+    """
+    User = apps.get_model('auth', 'User')
+    duplicates = list(
+        User.objects.using(schema_editor.connection.alias)
+        .exclude(email='')
+        .annotate(email_lower=Lower('email'))
+        .values('email_lower')
+        .annotate(count=Count('id'))
+        .filter(count__gt=1)
+        .values_list('email_lower', flat=True)
+        .order_by('email_lower')
+    )
+    if duplicates:
+        raise RuntimeError(
+            "Cannot create the case-insensitive unique index on auth_user.email: "
+            f"{len(duplicates)} email address(es) are used by more than one user "
+            f"(ignoring case): {', '.join(duplicates)}. Change or merge these "
+            "accounts, then run migrate again."
+        )
+
+
+def create_email_index(apps, schema_editor):
+    check_duplicate_emails(apps, schema_editor)
+    concurrently = 'CONCURRENTLY ' if schema_editor.connection.vendor == 'postgresql' else ''
+    schema_editor.execute(
+        f"CREATE UNIQUE INDEX {concurrently}{INDEX_NAME} "
+        f"ON auth_user (lower(email)) WHERE email <> ''"
+    )
+
+
+def drop_email_index(apps, schema_editor):
+    schema_editor.execute(f"DROP INDEX IF EXISTS {INDEX_NAME}")
+
+
+class Migration(migrations.Migration):
+    # CREATE INDEX CONCURRENTLY cannot run inside a transaction
+    atomic = False
+
+    dependencies = [
+        ('auth', '0012_alter_user_first_name_max_length'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_email_index, drop_email_index),
+    ]
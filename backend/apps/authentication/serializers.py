@@ -2,6 +2,14 @@ from rest_framework import serializers
 from django.contrib.auth.models import User
 from django.contrib.auth import authenticate
 from django.contrib.auth.password_validation import validate_password
+from django.db import IntegrityError, transaction
+from .auth import cache_login, get_cached_login
+
+EMAIL_TAKEN_MESSAGE = "A user with this email already exists."
+
+def _is_email_conflict(error):
+    """Whether an IntegrityError comes from the auth_user_email_uniq index"""
+    return 'email' in str(error).lower()
 
 class UserRegistrationSerializer(serializers.ModelSerializer):
     """
@@ -24,14 +32,16 @@ class UserRegistrationSerializer(serializers.ModelSerializer):
             raise serializers.ValidationError("Passwords don't match")
         return attrs
     
-    def validate_email(self, value):
-        if User.objects.filter(email=value).exists():
-            raise serializers.ValidationError("A user with this email already exists.")
-        return value
-    
     def create(self, validated_data):
         validated_data.pop('password_confirm')
-        user = User.objects.create_user(**validated_data)
+        # Email uniqueness is enforced by the auth_user_email_uniq index
+        try:
+            with transaction.atomic():
+                user = User.objects.create_user(**validated_data)
+        except IntegrityError as e:
+            if not _is_email_conflict(e):
+                raise
+            raise serializers.ValidationError({'email': [EMAIL_TAKEN_MESSAGE]})
         return user
 
 class UserProfileSerializer(serializers.ModelSerializer):
@@ -44,10 +54,22 @@ class UserProfileSerializer(serializers.ModelSerializer):
         read_only_fields = ('id', 'username', 'date_joined', 'is_staff')
     
     def validate_email(self, value):
+        # Case-insensitive, like the auth_user_email_uniq index on lower(email)
         user = self.instance
-        if User.objects.filter(email=value).exclude(pk=user.pk).exists():
-            raise serializers.ValidationError("A user with this email already exists.")
+        if value and User.objects.filter(email__iexact=value).exclude(pk=user.pk).exists():
+            raise serializers.ValidationError(EMAIL_TAKEN_MESSAGE)
         return value
+    
+    def update(self, instance, validated_data):
+        # A concurrent update can still take the email between the check
+        # above and the save; the index turns that into an IntegrityError
+        try:
+            with transaction.atomic():
+                return super().update(instance, validated_data)
+        except IntegrityError as e:
+            if not _is_email_conflict(e):
+                raise
+            raise serializers.ValidationError({'email': [EMAIL_TAKEN_MESSAGE]})
 
 class CustomAuthTokenSerializer(serializers.Serializer):
     """
@@ -65,22 +87,19 @@ class CustomAuthTokenSerializer(serializers.Serializer):
         password = attrs.get('password')
         
         if username_or_email and password:
-            # Try to authenticate with username first
-            user = authenticate(request=self.context.get('request'),
-                              username=username_or_email, password=password)
-            
-            # If authentication failed, try with email
-            if not user:
-                try:
-                    user_obj = User.objects.get(email=username_or_email)
-                    user = authenticate(request=self.context.get('request'),
-                                      username=user_obj.username, password=password)
-                except User.DoesNotExist:
-                    pass
+            # Repeat logins with the same credentials skip password hashing
+            user = get_cached_login(username_or_email, password)
             
             if not user:
-                msg = 'Unable to log in with provided credentials.'
-                raise serializers.ValidationError(msg, code='authorization')
+                # The EmailOrUsernameBackend resolves either form in one query
+                user = authenticate(request=self.context.get('request'),
+                                  username=username_or_email, password=password)
+                
+                if not user:
+                    msg = 'Unable to log in with provided credentials.'
+                    raise serializers.ValidationError(msg, code='authorization')
+                
+                cache_login(username_or_email, password, user)
             
             if not user.is_active:
                 msg = 'User account is disabled.'
@@ -0,0 +1,63 @@
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+from rest_framework.authtoken.models import Token
+from apps.fields.models import Farm, Field, Alert
+from .auth import invalidate_cached_token
+
+USER_STATS_CACHE_TIMEOUT = 60  # 1 minute
+PROFILE_CACHE_TIMEOUT = 600  # 10 minutes
+
+
+def user_stats_cache_key(user_id):
+    return f"stats:{user_id}"
+
+
+def profile_cache_key(user_id):
+    return f"profile:{user_id}"
+
+
+@receiver([post_save, post_delete], sender=User)
+def invalidate_user_profile(sender, instance, **kwargs):
+    """
+    Drop the cached profile payload whenever the user row changes.
+    """
+    cache.delete(profile_cache_key(instance.pk))
+
+
+@receiver(post_delete, sender=Token)
+def invalidate_deleted_token(sender, instance, **kwargs):
+    """
+    Drop a deleted token from the authentication cache, including tokens
+    removed together with their user.
+    """
+    invalidate_cached_token(instance.key)
+
+
+@receiver([post_save, post_delete], sender=Farm)
+def invalidate_farm_owner_stats(sender, instance, **kwargs):
+    """
+    Drop the cached user statistics of the farm owner.
+    """
+    cache.delete(user_stats_cache_key(instance.owner_id))
+
+
+@receiver([post_save, post_delete], sender=Field)
+def invalidate_field_owner_stats(sender, instance, **kwargs):
+    """
+    Drop the cached user statistics of the field's farm owner.
+    """
+    owner_id = Farm.objects.filter(pk=instance.farm_id).values_list('owner_id', flat=True).first()
+    if owner_id:
+        cache.delete(user_stats_cache_key(owner_id))
+
+
+@receiver([post_save, post_delete], sender=Alert)
+def invalidate_alert_owner_stats(sender, instance, **kwargs):
+    """
+    Drop the cached user statistics of the alert's farm owner.
+    """
+    # Alerts carry their farm, so this is a primary key lookup at most (and
+    # free when the farm is already loaded)
+    cache.delete(user_stats_cache_key(instance.farm.owner_id))
@@ -1,17 +1,30 @@
+import hashlib
+import json
 from rest_framework import status, generics, permissions
 from rest_framework.decorators import api_view, permission_classes
 from rest_framework.response import Response
+from rest_framework.throttling import ScopedRateThrottle
 from rest_framework.authtoken.models import Token
 from rest_framework.authtoken.views import ObtainAuthToken
 from django.contrib.auth import authenticate
 from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import transaction
+from django.db.models import Count, Q
 from .serializers import UserRegistrationSerializer, UserProfileSerializer, CustomAuthTokenSerializer
+from .auth import cache_token, check_password_cached, invalidate_cached_token
+from .signals import (
+    user_stats_cache_key, USER_STATS_CACHE_TIMEOUT, profile_cache_key, PROFILE_CACHE_TIMEOUT
+)
 
 class CustomAuthToken(ObtainAuthToken):
     """
     Custom authentication token view that returns user data along with token.
     """
     serializer_class = CustomAuthTokenSerializer
+    throttle_classes = [ScopedRateThrottle]
+    throttle_scope = 'login'
     
     def post(self, request, *args, **kwargs):
         serializer = self.serializer_class(data=request.data,
@@ -19,6 +32,7 @@ class CustomAuthToken(ObtainAuthToken):
         serializer.is_valid(raise_exception=True)
         user = serializer.validated_data['user']
         token, created = Token.objects.get_or_create(user=user)
+        cache_token(token, user)
         return Response({
             'token': token.key,
             'user': {
@@ -43,8 +57,12 @@ class UserRegistrationView(generics.CreateAPIView):
     def create(self, request, *args, **kwargs):
         serializer = self.get_serializer(data=request.data)
         serializer.is_valid(raise_exception=True)
-        user = serializer.save()
-        token, created = Token.objects.get_or_create(user=user)
+        # The user is brand new, so the token can be created directly
+        # (no get_or_create lookup) in the same transaction
+        with transaction.atomic():
+            user = serializer.save()
+            token = Token.objects.create(user=user)
+        cache_token(token, user)
         
         return Response({
             'user': {
@@ -68,6 +86,27 @@ class UserProfileView(generics.RetrieveUpdateAPIView):
     
     def get_object(self):
         return self.request.user
+    
+    def retrieve(self, request, *args, **kwargs):
+        cache_key = profile_cache_key(request.user.id)
+        cached = cache.get(cache_key)
+        
+        if cached is None:
+            # request.user may come from the token cache, so the entry that
+            # is kept for PROFILE_CACHE_TIMEOUT is built from the current row
+            user = User.objects.get(pk=request.user.pk)
+            data = self.get_serializer(user).data
+            etag = '"%s"' % hashlib.md5(
+                json.dumps(data, sort_keys=True, cls=DjangoJSONEncoder).encode()
+            ).hexdigest()
+            cached = (etag, data)
+            cache.set(cache_key, cached, timeout=PROFILE_CACHE_TIMEOUT)
+        
+        etag, data = cached
+        if request.META.get('HTTP_IF_NONE_MATCH') == etag:
+            return Response(status=status.HTTP_304_NOT_MODIFIED, headers={'ETag': etag})
+        
+        return Response(data, headers={'ETag': etag})
 
 @api_view(['POST'])
 @permission_classes([permissions.IsAuthenticated])
@@ -78,6 +117,7 @@ def logout_view(request):
     try:
         token = Token.objects.get(user=request.user)
         token.delete()
+        invalidate_cached_token(token.key)
         return Response({
             'message': 'Successfully logged out'
         }, status=status.HTTP_200_OK)
@@ -101,7 +141,7 @@ def change_password(request):
             'error': 'Both old_password and new_password are required'
         }, status=status.HTTP_400_BAD_REQUEST)
     
-    if not user.check_password(old_password):
+    if not check_password_cached(user, old_password):
         return Response({
             'error': 'Old password is incorrect'
         }, status=status.HTTP_400_BAD_REQUEST)
@@ -118,10 +158,12 @@ def change_password(request):
     try:
         token = Token.objects.get(user=user)
         token.delete()
+        invalidate_cached_token(token.key)
     except Token.DoesNotExist:
         pass
     
     new_token = Token.objects.create(user=user)
+    cache_token(new_token, user)
     
     return Response({
         'message': 'Password changed successfully',
@@ -136,20 +178,29 @@ def user_stats(request):
     """
     user = request.user
     
-    # Import here to avoid circular imports
-    from apps.fields.models import Farm, Field, Alert
+    cache_key = user_stats_cache_key(user.id)
+    counts = cache.get(cache_key)
     
-    farms_count = Farm.objects.filter(owner=user).count()
-    fields_count = Field.objects.filter(farm__owner=user).count()
-    active_alerts = Alert.objects.filter(
-        field__farm__owner=user,
-        is_resolved=False
-    ).count()
+    if counts is None:
+        # Import here to avoid circular imports
+        from apps.fields.models import Farm
+        
+        # Single aggregate over the farm -> field -> alert joins
+        counts = Farm.objects.filter(owner=user).aggregate(
+            farms_count=Count('id', distinct=True),
+            fields_count=Count('fields', distinct=True),
+            active_alerts=Count(
+                'fields__alerts',
+                filter=Q(fields__alerts__is_resolved=False),
+                distinct=True
+            ),
+        )
+        cache.set(cache_key, counts, timeout=USER_STATS_CACHE_TIMEOUT)
     
     return Response({
-        'farms_count': farms_count,
-        'fields_count': fields_count,
-        'active_alerts': active_alerts,
+        'farms_count': counts['farms_count'],
+        'fields_count': counts['fields_count'],
+        'active_alerts': counts['active_alerts'],
         'user': {
             'id': user.id,
             'username': user.username,
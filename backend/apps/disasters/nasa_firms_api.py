@@ -1,23 +1,67 @@
+import hashlib
+import io
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 import logging
+import threading
+import time
+from collections import OrderedDict, defaultdict
+from concurrent.futures import ThreadPoolExecutor
+import numpy as np
+import pandas as pd
 from datetime import datetime, timedelta
 from django.conf import settings
+from django.core.cache import cache
 # from django.contrib.gis.geos import Point, Polygon  # Temporarily disabled
 # from django.contrib.gis.measure import Distance  # Temporarily disabled
 from typing import List, Dict, Optional, Tuple
 
 logger = logging.getLogger(__name__)
 
+# Shared session so keep-alive connections to FIRMS are reused across
+# NASAFirmsAPI instances (one per task / request) instead of re-handshaking.
+_SESSION = requests.Session()
+_SESSION.mount('https://', HTTPAdapter(
+    pool_connections=20,
+    pool_maxsize=50,
+    max_retries=Retry(total=3, backoff_factor=0.5, status_forcelist=(502, 503, 504))
+))
+
 class NASAFirmsAPI:
     """
     Client for NASA FIRMS (Fire Information for Resource Management System) API.
     Provides access to active fire data from MODIS and VIIRS satellites.
     """
     
+    NUMERIC_COLUMNS = ('latitude', 'longitude', 'brightness', 'confidence', 'frp')
+    
+    CACHE_TIMEOUT = 1800  # 30 minutes
+    
+    # Point and batch queries are widened to this grid so that nearby fields
+    # request the same area and share its cache entry
+    TILE_DEGREES = 0.25  # ~28 km at the equator
+    
+    # Batch assessments fetch one area per region of this size, so a batch
+    # of fields spread over several continents does not download everything
+    # in between
+    REGION_DEGREES = 5.0
+    MAX_CONCURRENT_REQUESTS = 8
+    
+    # In-process LRU in front of the shared cache, so repeated lookups in a
+    # worker (retries, neighbouring chunks) skip the cache round trip and
+    # unpickling the fire DataFrame
+    LOCAL_CACHE_SIZE = 256
+    LOCAL_CACHE_TIMEOUT = 900  # 15 minutes
+    
     def __init__(self, api_key: Optional[str] = None):
         self.api_key = api_key or getattr(settings, 'NASA_FIRMS_API_KEY', None)
         self.base_url = 'https://firms.modaps.eosdis.nasa.gov/api'
-        self.session = requests.Session()
+        self.session = _SESSION
+        self._local_cache = OrderedDict()
+        # The client is shared, and batch assessments fetch regions from a
+        # thread pool, so every LRU access holds this lock
+        self._local_cache_lock = threading.Lock()
         
         if not self.api_key:
             logger.warning("NASA FIRMS API key not configured")
@@ -37,6 +81,20 @@ class NASAFirmsAPI:
         Returns:
             Dictionary containing fire data and metadata
         """
+        result = self._get_fires_frame_by_area(bbox, days_back, source)
+        
+        if 'error' not in result:
+            result['fires'] = result['fires'].to_dict('records')
+        
+        return result
+    
+    def _get_fires_frame_by_area(self,
+                                 bbox: Tuple[float, float, float, float],
+                                 days_back: int = 7,
+                                 source: str = 'MODIS_NRT') -> Dict:
+        """
+        Same as get_active_fires_by_area, but 'fires' is left as a DataFrame.
+        """
         if not self.api_key:
             return {'error': 'NASA FIRMS API key not configured'}
         
@@ -48,17 +106,31 @@ class NASAFirmsAPI:
             end_date = datetime.now()
             start_date = end_date - timedelta(days=days_back)
             
+            # FIRMS NRT data only refreshes every few hours, so identical
+            # queries are served from the cache: first this process' own
+            # copy, then the shared cache
+            cache_key = self._cache_key(source, bbox_str, days_back, end_date.date())
+            cached = self._local_cache_get(cache_key)
+            if cached is not None:
+                return cached
+            
+            cached = cache.get(cache_key)
+            if cached is not None:
+                self._local_cache_set(cache_key, cached)
+                return dict(cached)
+            
             url = f"{self.base_url}/area/csv/{self.api_key}/{source}/{bbox_str}/{days_back}"
             
             logger.info(f"Fetching fire data from FIRMS API: {url}")
             
-            response = self.session.get(url, timeout=30)
-            response.raise_for_status()
+            # Stream the body straight into the CSV parser rather than
+            # materializing it as one decoded string first
+            with self.session.get(url, timeout=30, stream=True) as response:
+                response.raise_for_status()
+                response.raw.decode_content = True
+                fires = self._parse_csv_frame(response.raw)
             
-            # Parse CSV response
-            fires = self._parse_csv_response(response.text)
-            
-            return {
+            result = {
                 'fires': fires,
                 'source': source,
                 'bbox': bbox,
@@ -68,14 +140,73 @@ class NASAFirmsAPI:
                 },
                 'total_fires': len(fires)
             }
+            cache.set(cache_key, result, timeout=self.CACHE_TIMEOUT)
+            self._local_cache_set(cache_key, result)
+            
+            return dict(result)
             
         except requests.exceptions.RequestException as e:
             logger.error(f"Error fetching fire data from FIRMS API: {e}")
-            return {'error': f'API request failed: {str(e)}'}
+            # Connection errors, timeouts, rate limiting and 5xx responses
+            # are transient; callers that can retry later look at this flag
+            response = e.response
+            retryable = response is None or response.status_code == 429 or response.status_code >= 500
+            return {'error': f'API request failed: {str(e)}', 'retryable': retryable}
         except Exception as e:
             logger.error(f"Error processing fire data: {e}")
             return {'error': f'Data processing failed: {str(e)}'}
     
+    def _cache_key(self, source: str, bbox_str: str, days_back: int, day) -> str:
+        """
+        Build the cache key for a FIRMS area query. The day is part of the
+        key since the query window is relative to the current date.
+        """
+        digest = hashlib.blake2b(
+            f"{source}|{bbox_str}|{days_back}|{day.isoformat()}".encode(), digest_size=16
+        ).hexdigest()
+        return f"firms:{digest}"
+    
+    def _local_cache_get(self, cache_key: str) -> Optional[Dict]:
+        """
+        Look up a FIRMS result in the in-process LRU cache.
+        
+        A shallow copy is returned since callers replace result['fires'].
+        """
+        with self._local_cache_lock:
+            entry = self._local_cache.get(cache_key)
+            if entry is None:
+                return None
+            
+            expires_at, result = entry
+            if expires_at < time.monotonic():
+                self._local_cache.pop(cache_key, None)
+                return None
+            
+            self._local_cache.move_to_end(cache_key)
+        return dict(result)
+    
+    def _local_cache_set(self, cache_key: str, result: Dict) -> None:
+        """
+        Store a FIRMS result in the in-process LRU cache.
+        """
+        with self._local_cache_lock:
+            self._local_cache[cache_key] = (time.monotonic() + self.LOCAL_CACHE_TIMEOUT, result)
+            self._local_cache.move_to_end(cache_key)
+            while len(self._local_cache) > self.LOCAL_CACHE_SIZE:
+                self._local_cache.popitem(last=False)
+    
+    def _snap_to_tiles(self, bbox: Tuple[float, float, float, float]) -> Tuple[float, float, float, float]:
+        """
+        Expand a bounding box outward to the TILE_DEGREES grid.
+        """
+        tile = self.TILE_DEGREES
+        return (
+            max(-180.0, math.floor(bbox[0] / tile) * tile),
+            max(-90.0, math.floor(bbox[1] / tile) * tile),
+            min(180.0, math.ceil(bbox[2] / tile) * tile),
+            min(90.0, math.ceil(bbox[3] / tile) * tile)
+        )
+    
     def get_fires_near_point(self,
                            latitude: float,
                            longitude: float,
@@ -95,12 +226,10 @@ class NASAFirmsAPI:
         Returns:
             Dictionary containing fire data and metadata
         """
-        # Create bounding box from point and radius
-        center_point = Point(longitude, latitude)
-        
         # Approximate degrees per kilometer (varies by latitude)
+        cos_lat = math.cos(math.radians(latitude))
         lat_deg_per_km = 1 / 111.0
-        lon_deg_per_km = 1 / (111.0 * abs(math.cos(math.radians(latitude))))
+        lon_deg_per_km = 1 / (111.0 * abs(cos_lat))
         
         lat_offset = radius_km * lat_deg_per_km
         lon_offset = radius_km * lon_deg_per_km
@@ -112,21 +241,14 @@ class NASAFirmsAPI:
             latitude + lat_offset    # max_lat
         )
         
-        # Get fires in bounding box
-        result = self.get_active_fires_by_area(bbox, days_back, source)
+        # Get fires in the tile-aligned bounding box
+        result = self._get_fires_frame_by_area(self._snap_to_tiles(bbox), days_back, source)
         
         if 'error' in result:
             return result
         
         # Filter fires by actual distance
-        filtered_fires = []
-        for fire in result['fires']:
-            fire_point = Point(fire['longitude'], fire['latitude'])
-            distance_km = center_point.distance(fire_point) * 111.0  # Approximate conversion to km
-            
-            if distance_km <= radius_km:
-                fire['distance_km'] = round(distance_km, 2)
-                filtered_fires.append(fire)
+        filtered_fires = self._fires_near_frame(result['fires'], latitude, longitude, radius_km)
         
         result['fires'] = filtered_fires
         result['total_fires'] = len(filtered_fires)
@@ -135,15 +257,38 @@ class NASAFirmsAPI:
         
         return result
     
+    def _fires_near_frame(self,
+                          df: pd.DataFrame,
+                          latitude: float,
+                          longitude: float,
+                          radius_km: float) -> List[Dict]:
+        """
+        Select the fires of a FIRMS DataFrame within a radius of a point
+        (equirectangular approximation), closest first.
+        """
+        if df.empty:
+            return []
+        
+        cos_lat = math.cos(math.radians(latitude))
+        dlat = df['latitude'].to_numpy() - latitude
+        dlon = (df['longitude'].to_numpy() - longitude) * cos_lat
+        distance_km = np.sqrt(dlat ** 2 + dlon ** 2) * 111.0
+        mask = distance_km <= radius_km
+        
+        df = df[mask].assign(distance_km=np.round(distance_km[mask], 2))
+        return df.sort_values('distance_km').to_dict('records')
+    
     def get_fire_risk_assessment(self,
-                               field_boundary,  # Polygon object
+                               latitude: float,
+                               longitude: float,
                                buffer_km: float = 10,
                                days_back: int = 14) -> Dict:
         """
         Assess fire risk for a field based on nearby fire activity.
         
         Args:
-            field_boundary: Field boundary as a Polygon
+            latitude: Latitude of the field centroid
+            longitude: Longitude of the field centroid
             buffer_km: Buffer distance in kilometers around the field
             days_back: Number of days to analyze
             
@@ -151,144 +296,232 @@ class NASAFirmsAPI:
             Dictionary containing risk assessment
         """
         try:
-            # Get field centroid
-            centroid = field_boundary.centroid
-            
             # Get fires near the field
             fire_data = self.get_fires_near_point(
-                centroid.y, centroid.x, buffer_km, days_back
+                latitude, longitude, buffer_km, days_back
             )
             
             if 'error' in fire_data:
                 return fire_data
             
-            fires = fire_data['fires']
+            return self._assess_fire_risk(fire_data['fires'], buffer_km, days_back)
             
-            # Calculate risk metrics
-            total_fires = len(fires)
+        except Exception as e:
+            logger.error(f"Error assessing fire risk: {e}")
+            return {'error': f'Risk assessment failed: {str(e)}'}
+    
+    def get_fire_risk_assessments(self,
+                                  centroids: List[Tuple[float, float]],
+                                  buffer_km: float = 10,
+                                  days_back: int = 14) -> List[Dict]:
+        """
+        Assess fire risk for several fields with as few FIRMS requests as possible.
+        
+        Fields are grouped by REGION_DEGREES cells; fires are fetched once per
+        region for the bounding box around its field centroids (expanded by
+        buffer_km), with the regions fetched concurrently, and assigned to
+        each field locally.
+        
+        Args:
+            centroids: Field centroids as (latitude, longitude)
+            buffer_km: Buffer distance in kilometers around each field
+            days_back: Number of days to analyze
             
-            if total_fires == 0:
-                risk_level = 'low'
-                risk_score = 0
+        Returns:
+            List of risk assessments, in the order of centroids
+        """
+        try:
+            if not centroids:
+                return []
+            
+            regions = defaultdict(list)
+            for index, (lat, lon) in enumerate(centroids):
+                regions[(lat // self.REGION_DEGREES, lon // self.REGION_DEGREES)].append(index)
+            regions = list(regions.values())
+            
+            bboxes = [
+                self._snap_to_tiles(self._buffered_bbox([centroids[i] for i in region], buffer_km))
+                for region in regions
+            ]
+            
+            if len(bboxes) == 1:
+                region_data = [self._get_fires_frame_by_area(bboxes[0], days_back)]
             else:
-                # Calculate risk based on fire count, proximity, and confidence
-                close_fires = [f for f in fires if f.get('distance_km', float('inf')) <= 5]
-                high_confidence_fires = [f for f in fires if f.get('confidence', 0) >= 80]
-                recent_fires = [f for f in fires if self._is_recent_fire(f, days=3)]
-                
-                # Risk scoring algorithm
-                risk_score = min(100, (
-                    total_fires * 5 +
-                    len(close_fires) * 15 +
-                    len(high_confidence_fires) * 10 +
-                    len(recent_fires) * 20
-                ))
-                
-                if risk_score >= 70:
-                    risk_level = 'high'
-                elif risk_score >= 40:
-                    risk_level = 'medium'
-                else:
-                    risk_level = 'low'
+                with ThreadPoolExecutor(max_workers=min(len(bboxes), self.MAX_CONCURRENT_REQUESTS)) as executor:
+                    region_data = list(executor.map(
+                        lambda bbox: self._get_fires_frame_by_area(bbox, days_back), bboxes
+                    ))
             
-            # Find closest fire
-            closest_fire = None
-            min_distance = float('inf')
-            for fire in fires:
-                distance = fire.get('distance_km', float('inf'))
-                if distance < min_distance:
-                    min_distance = distance
-                    closest_fire = fire
+            assessments = [None] * len(centroids)
+            for region, fire_data in zip(regions, region_data):
+                for index in region:
+                    if 'error' in fire_data:
+                        assessments[index] = {
+                            'error': fire_data['error'],
+                            'retryable': fire_data.get('retryable', False)
+                        }
+                        continue
+                    
+                    lat, lon = centroids[index]
+                    assessments[index] = self._assess_fire_risk(
+                        self._fires_near_frame(fire_data['fires'], lat, lon, buffer_km),
+                        buffer_km, days_back
+                    )
             
-            return {
-                'risk_level': risk_level,
-                'risk_score': risk_score,
-                'total_fires': total_fires,
-                'fires_within_5km': len([f for f in fires if f.get('distance_km', float('inf')) <= 5]),
-                'fires_within_10km': len([f for f in fires if f.get('distance_km', float('inf')) <= 10]),
-                'closest_fire': closest_fire,
-                'closest_distance_km': min_distance if closest_fire else None,
-                'analysis_period_days': days_back,
-                'buffer_km': buffer_km,
-                'fires': fires[:10]  # Return top 10 closest fires
-            }
+            return assessments
             
         except Exception as e:
             logger.error(f"Error assessing fire risk: {e}")
-            return {'error': f'Risk assessment failed: {str(e)}'}
+            return [{'error': f'Risk assessment failed: {str(e)}'} for _ in centroids]
+    
+    def _buffered_bbox(self,
+                       points: List[Tuple[float, float]],
+                       buffer_km: float) -> Tuple[float, float, float, float]:
+        """
+        Bounding box around (latitude, longitude) points, expanded by buffer_km.
+        """
+        latitudes = [lat for lat, _ in points]
+        longitudes = [lon for _, lon in points]
+        
+        lat_offset = buffer_km / 111.0
+        # Widest longitude offset needed, at the latitude closest to a pole
+        max_lat = min(89.0, max(abs(lat) for lat in latitudes) + lat_offset)
+        lon_offset = buffer_km / (111.0 * math.cos(math.radians(max_lat)))
+        
+        return (
+            max(-180.0, min(longitudes) - lon_offset),  # min_lon
+            max(-90.0, min(latitudes) - lat_offset),    # min_lat
+            min(180.0, max(longitudes) + lon_offset),   # max_lon
+            min(90.0, max(latitudes) + lat_offset)      # max_lat
+        )
     
-    def _parse_csv_response(self, csv_text: str) -> List[Dict]:
+    def _assess_fire_risk(self, fires: List[Dict], buffer_km: float, days_back: int) -> Dict:
         """
-        Parse CSV response from FIRMS API.
+        Score the fire risk of a field from the fires around it.
         
         Args:
-            csv_text: Raw CSV text from API response
+            fires: Fires within buffer_km of the field, closest first
+            buffer_km: Buffer distance in kilometers around the field
+            days_back: Number of days analyzed
             
         Returns:
-            List of fire dictionaries
+            Dictionary containing risk assessment
         """
-        fires = []
-        lines = csv_text.strip().split('\n')
-        
-        if len(lines) < 2:
-            return fires
+        # Calculate risk metrics in a single pass over the fires
+        total_fires = len(fires)
+        n_close = n_10km = n_high_confidence = n_recent = 0
+        closest_fire = None
+        min_distance = float('inf')
+        recent_cutoff = datetime.now() - timedelta(days=3)
         
-        # Parse header
-        headers = [h.strip() for h in lines[0].split(',')]
+        for fire in fires:
+            distance = fire.get('distance_km', float('inf'))
+            if distance <= 5:
+                n_close += 1
+            if distance <= 10:
+                n_10km += 1
+            if fire.get('confidence', 0) >= 80:
+                n_high_confidence += 1
+            if 'datetime' in fire and fire['datetime'] >= recent_cutoff:
+                n_recent += 1
+            if distance < min_distance:
+                min_distance = distance
+                closest_fire = fire
         
-        # Parse data rows
-        for line in lines[1:]:
-            if not line.strip():
-                continue
-                
-            values = [v.strip() for v in line.split(',')]
-            
-            if len(values) != len(headers):
-                continue
-            
-            fire_data = dict(zip(headers, values))
-            
-            # Convert numeric fields
-            try:
-                fire_data['latitude'] = float(fire_data.get('latitude', 0))
-                fire_data['longitude'] = float(fire_data.get('longitude', 0))
-                fire_data['brightness'] = float(fire_data.get('brightness', 0))
-                fire_data['confidence'] = float(fire_data.get('confidence', 0))
-                fire_data['frp'] = float(fire_data.get('frp', 0))  # Fire Radiative Power
-                
-                # Parse date/time
-                if 'acq_date' in fire_data and 'acq_time' in fire_data:
-                    date_str = fire_data['acq_date']
-                    time_str = fire_data['acq_time'].zfill(4)  # Pad with zeros
-                    datetime_str = f"{date_str} {time_str[:2]}:{time_str[2:]}"
-                    fire_data['datetime'] = datetime.strptime(datetime_str, '%Y-%m-%d %H:%M')
-                
-            except (ValueError, KeyError) as e:
-                logger.warning(f"Error parsing fire data: {e}")
-                continue
+        if total_fires == 0:
+            risk_level = 'low'
+            risk_score = 0
+        else:
+            # Risk scoring algorithm based on fire count, proximity, and confidence
+            risk_score = min(100, (
+                total_fires * 5 +
+                n_close * 15 +
+                n_high_confidence * 10 +
+                n_recent * 20
+            ))
             
-            fires.append(fire_data)
+            if risk_score >= 70:
+                risk_level = 'high'
+            elif risk_score >= 40:
+                risk_level = 'medium'
+            else:
+                risk_level = 'low'
         
-        return fires
+        return {
+            'risk_level': risk_level,
+            'risk_score': risk_score,
+            'total_fires': total_fires,
+            'fires_within_5km': n_close,
+            'fires_within_10km': n_10km,
+            'closest_fire': closest_fire,
+            'closest_distance_km': min_distance if closest_fire else None,
+            'analysis_period_days': days_back,
+            'buffer_km': buffer_km,
+            'fires': fires[:10]  # Return top 10 closest fires
+        }
     
-    def _is_recent_fire(self, fire: Dict, days: int = 3) -> bool:
+    def _parse_csv_frame(self, csv_source) -> pd.DataFrame:
         """
-        Check if a fire is recent (within specified days).
+        Parse CSV response from FIRMS API into a DataFrame.
+        
+        Numeric and date/time columns are converted column-wise; rows whose
+        values cannot be converted are dropped.
         
         Args:
-            fire: Fire data dictionary
-            days: Number of days to consider as recent
+            csv_source: File-like object (e.g. a streamed response body) or
+                raw CSV text from API response
             
         Returns:
-            True if fire is recent, False otherwise
+            DataFrame with one row per fire
         """
-        if 'datetime' not in fire:
-            return False
+        if isinstance(csv_source, str):
+            csv_source = io.StringIO(csv_source)
         
-        fire_date = fire['datetime']
-        cutoff_date = datetime.now() - timedelta(days=days)
+        try:
+            df = pd.read_csv(
+                csv_source,
+                dtype=str,
+                skipinitialspace=True,
+                on_bad_lines='skip'
+            )
+        except pd.errors.EmptyDataError:
+            return pd.DataFrame()
         
-        return fire_date >= cutoff_date
+        df.columns = df.columns.str.strip()
+        
+        # Convert numeric fields
+        numeric = {}
+        for column in self.NUMERIC_COLUMNS:
+            if column in df.columns:
+                numeric[column] = pd.to_numeric(df[column].str.strip(), errors='coerce')
+            else:
+                numeric[column] = pd.Series(0.0, index=df.index)
+        
+        invalid = pd.DataFrame(numeric).isna().any(axis=1)
+        
+        # Parse date/time
+        if 'acq_date' in df.columns and 'acq_time' in df.columns:
+            # Acquisition dates repeat heavily across records, so parse the
+            # date column on its own with the result cache enabled and add
+            # the HHMM acquisition time arithmetically
+            acq_date = pd.to_datetime(
+                df['acq_date'].str.strip(), format='%Y-%m-%d', errors='coerce', cache=True
+            )
+            acq_time = pd.to_numeric(df['acq_time'].str.strip(), errors='coerce')
+            hours, minutes = acq_time // 100, acq_time % 100
+            acq_time = acq_time.where((hours < 24) & (minutes < 60))
+            
+            df['datetime'] = acq_date + pd.to_timedelta(hours * 60 + minutes, unit='m')
+            invalid |= acq_date.isna() | acq_time.isna()
+        
+        for column, values in numeric.items():
+            df[column] = values.astype(float)
+        
+        if invalid.any():
+            logger.warning(f"Skipped {int(invalid.sum())} unparseable fire records")
+            df = df[~invalid]
+        
+        return df.reset_index(drop=True)
     
     def validate_coordinates(self, latitude: float, longitude: float) -> bool:
         """
@@ -304,4 +537,7 @@ class NASAFirmsAPI:
         return (-90 <= latitude <= 90) and (-180 <= longitude <= 180)
 
 # Import math for coordinate calculations
-import math
\ No newline at end of file
+import math
+
+# Module-level client shared by tasks and views
+NASA_FIRMS_CLIENT = NASAFirmsAPI()
\ No newline at end of file
@@ -1,14 +1,26 @@
-from celery import shared_task
+from celery import chord, shared_task
+from django.core.cache import cache
+from django.db import DatabaseError, OperationalError
 from django.utils import timezone
 from django.contrib.auth.models import User
 from datetime import datetime, timedelta
+from apps.authentication.signals import user_stats_cache_key
 from apps.fields.models import Field, Alert
-from .nasa_firms_api import NASAFirmsAPI
+from apps.fields.signals import invalidate_farm_stats
+from .nasa_firms_api import NASA_FIRMS_CLIENT as nasa_api
 import logging
+import requests
 
 logger = logging.getLogger(__name__)
 
-@shared_task(bind=True, max_retries=3)
+FIRE_CHECK_CHUNK_SIZE = 100
+CLEANUP_BATCH_SIZE = 10000
+
+# Transient failures worth retrying the field check for
+RETRYABLE_ERRORS = (requests.RequestException, TimeoutError, OperationalError)
+
+@shared_task(bind=True, autoretry_for=RETRYABLE_ERRORS, retry_backoff=60,
+             retry_backoff_max=1800, retry_jitter=True, max_retries=11)
 def check_fire_alerts_for_field(self, field_id, buffer_km=10, create_alerts=True):
     """
     Check for fire alerts around a specific field.
@@ -19,60 +31,95 @@ def check_fire_alerts_for_field(self, field_id, buffer_km=10, create_alerts=True
         create_alerts: Whether to create alert records
     """
     try:
-        field = Field.objects.get(id=field_id)
-        
-        if not field.boundary:
-            logger.warning(f"Field {field_id} has no boundary")
-            return {'status': 'error', 'message': 'Field has no geographic boundary'}
-        
-        nasa_api = NASAFirmsAPI()
-        
-        # Get fire risk assessment
-        risk_data = nasa_api.get_fire_risk_assessment(
-            field.boundary, buffer_km, days_back=7
-        )
-        
-        if 'error' in risk_data:
-            logger.error(f"Failed to get fire risk for field {field_id}: {risk_data['error']}")
-            return {'status': 'error', 'message': risk_data['error']}
+        field = Field.objects.select_related('farm__owner').get(id=field_id)
         
-        result = {
-            'status': 'success',
-            'field_id': field_id,
-            'risk_level': risk_data['risk_level'],
-            'risk_score': risk_data['risk_score'],
-            'total_fires': risk_data['total_fires'],
-            'alerts_created': 0
-        }
+        result, risk_data = _assess_field_fire_risk(field, nasa_api, buffer_km)
         
         # Create alerts if fires are detected and create_alerts is True
-        if create_alerts and risk_data['total_fires'] > 0:
-            alert_created = _create_fire_alert(field, risk_data)
-            if alert_created:
+        if create_alerts and risk_data and risk_data['total_fires'] > 0:
+            if _create_fire_alert(field, risk_data):
                 result['alerts_created'] = 1
         
-        logger.info(f"Fire check completed for field {field_id}: {result}")
         return result
         
     except Field.DoesNotExist:
-        logger.error(f"Field {field_id} not found")
-        return {'status': 'error', 'message': 'Field not found'}
+        logger.error("Field %s not found", field_id)
+        return {'status': 'error', 'field_id': field_id, 'message': 'Field not found'}
+    
+    except RETRYABLE_ERRORS:
+        # Retried by Celery with exponential backoff and jitter
+        raise
     
     except Exception as e:
-        logger.error(f"Error checking fire alerts for field {field_id}: {e}")
-        
-        # Retry logic
-        if self.request.retries < self.max_retries:
-            logger.info(f"Retrying fire check for field {field_id} (attempt {self.request.retries + 1})")
-            raise self.retry(countdown=60 * (2 ** self.request.retries))
+        logger.error("Error checking fire alerts for field %s: %s", field_id, e)
+        return {'status': 'error', 'field_id': field_id, 'message': str(e)}
+
+@shared_task
+def check_fire_alerts_for_fields(field_ids, buffer_km=10, create_alerts=True):
+    """
+    Check for fire alerts around a batch of fields.
+    
+    The fields (with their farm and owner) are loaded with a single query
+    instead of one lookup per field, the fires for the whole batch are
+    fetched with a single FIRMS request, and the alerts are deduplicated and
+    inserted with one query each.
+    
+    Args:
+        field_ids: List of field UUID strings
+        buffer_km: Buffer distance in kilometers around the fields
+        create_alerts: Whether to create alert records
         
-        return {'status': 'error', 'message': str(e)}
+    Returns:
+        List of per-field results, as returned by check_fire_alerts_for_field
+    """
+    fields = Field.objects.filter(id__in=field_ids).select_related('farm__owner')
+    
+    results = []
+    fields_to_assess = []
+    for field in fields.iterator(chunk_size=FIRE_CHECK_CHUNK_SIZE):
+        if field.centroid is None:
+            logger.warning("Field %s has no boundary", field.id)
+            results.append({'status': 'error', 'field_id': str(field.id), 'message': 'Field has no geographic boundary'})
+        else:
+            fields_to_assess.append(field)
+    
+    # One FIRMS request for the whole batch, fires are matched to fields locally
+    risk_assessments = nasa_api.get_fire_risk_assessments(
+        [field.centroid for field in fields_to_assess], buffer_km, days_back=7
+    )
+    
+    fields_with_fires = []
+    for field, risk_data in zip(fields_to_assess, risk_assessments):
+        result = _fire_check_result(field, risk_data)
+        results.append(result)
+        if result['status'] == 'success' and risk_data['total_fires'] > 0:
+            fields_with_fires.append((field, risk_data))
+    
+    # Create alerts if fires are detected and create_alerts is True
+    if create_alerts:
+        alerted_field_ids = {str(field_id) for field_id in _create_fire_alerts(fields_with_fires)}
+        for result in results:
+            if result['field_id'] in alerted_field_ids:
+                result['alerts_created'] = 1
+    
+    found_ids = {result['field_id'] for result in results}
+    for field_id in field_ids:
+        if field_id not in found_ids:
+            logger.error("Field %s not found", field_id)
+            results.append({'status': 'error', 'field_id': field_id, 'message': 'Field not found'})
+    
+    return results
 
 @shared_task(bind=True)
 def check_fire_alerts_for_all_fields(self, user_id=None, buffer_km=10, create_alerts=True):
     """
     Check for fire alerts for all fields (or all fields of a specific user).
     
+    The fields are split into chunks of FIRE_CHECK_CHUNK_SIZE, each checked
+    by its own check_fire_alerts_for_fields subtask so workers can run the
+    FIRMS requests in parallel; the results are combined by
+    summarize_fire_alert_checks once all subtasks have finished.
+    
     Args:
         user_id: Optional user ID to limit to specific user's fields
         buffer_km: Buffer distance in kilometers
@@ -85,66 +132,71 @@ def check_fire_alerts_for_all_fields(self, user_id=None, buffer_km=10, create_al
         else:
             fields = Field.objects.all()
         
-        if not fields.exists():
-            logger.info(f"No fields found for user {user_id if user_id else 'all users'}")
-            return {'status': 'no_fields', 'message': 'No fields to check'}
+        # One pass over the ids only: no default ordering to sort by and no
+        # separate exists()/count() queries, the list gives both
+        field_ids = [
+            str(field_id)
+            for field_id in fields.order_by().values_list('id', flat=True).iterator(chunk_size=2000)
+        ]
         
-        results = {
-            'status': 'success',
-            'total_fields': fields.count(),
-            'fields_processed': 0,
-            'fields_with_fires': 0,
-            'total_alerts_created': 0,
-            'errors': []
-        }
+        if not field_ids:
+            logger.info("No fields found for user %s", user_id if user_id else 'all users')
+            return {'status': 'no_fields', 'message': 'No fields to check'}
         
-        nasa_api = NASAFirmsAPI()
-        
-        for field in fields:
-            try:
-                if not field.boundary:
-                    logger.warning(f"Field {field.id} has no boundary, skipping")
-                    continue
-                
-                # Get fire risk assessment
-                risk_data = nasa_api.get_fire_risk_assessment(
-                    field.boundary, buffer_km, days_back=7
-                )
-                
-                if 'error' in risk_data:
-                    logger.warning(f"Error getting fire risk for field {field.id}: {risk_data['error']}")
-                    results['errors'].append({
-                        'field_id': str(field.id),
-                        'error': risk_data['error']
-                    })
-                    continue
-                
-                results['fields_processed'] += 1
-                
-                if risk_data['total_fires'] > 0:
-                    results['fields_with_fires'] += 1
-                    
-                    # Create alert if requested
-                    if create_alerts:
-                        alert_created = _create_fire_alert(field, risk_data)
-                        if alert_created:
-                            results['total_alerts_created'] += 1
-                
-            except Exception as e:
-                logger.error(f"Error processing field {field.id}: {e}")
-                results['errors'].append({
-                    'field_id': str(field.id),
-                    'error': str(e)
-                })
-                continue
+        result = chord(
+            check_fire_alerts_for_fields.s(field_ids[i:i + FIRE_CHECK_CHUNK_SIZE], buffer_km, create_alerts)
+            for i in range(0, len(field_ids), FIRE_CHECK_CHUNK_SIZE)
+        )(summarize_fire_alert_checks.s(user_id=user_id))
         
-        logger.info(f"Bulk fire check completed: {results}")
-        return results
+        logger.info("Bulk fire check dispatched for %s fields", len(field_ids))
+        return {
+            'status': 'dispatched',
+            'total_fields': len(field_ids),
+            'summary_task_id': result.id
+        }
         
     except Exception as e:
-        logger.error(f"Error in bulk fire alert check: {e}")
+        logger.error("Error in bulk fire alert check: %s", e)
         return {'status': 'error', 'message': str(e)}
 
+@shared_task
+def summarize_fire_alert_checks(chunk_results, user_id=None):
+    """
+    Combine the per-field results of a bulk fire alert check.
+    
+    Args:
+        chunk_results: List of check_fire_alerts_for_fields return values
+        user_id: User ID the check was limited to, if any
+    """
+    field_results = [field_result for chunk in chunk_results for field_result in chunk]
+    
+    results = {
+        'status': 'success',
+        'user_id': user_id,
+        'total_fields': len(field_results),
+        'fields_processed': 0,
+        'fields_with_fires': 0,
+        'total_alerts_created': 0,
+        'errors': []
+    }
+    
+    for field_result in field_results:
+        if field_result.get('status') != 'success':
+            results['errors'].append({
+                'field_id': field_result.get('field_id'),
+                'error': field_result.get('message')
+            })
+            continue
+        
+        results['fields_processed'] += 1
+        
+        if field_result['total_fires'] > 0:
+            results['fields_with_fires'] += 1
+        results['total_alerts_created'] += field_result['alerts_created']
+    
+    logger.info("Bulk fire check completed for user %s: %s", user_id if user_id else 'all users', results)
+    return results
+
 @shared_task
 def cleanup_old_fire_alerts(days_to_keep=90):
     """
@@ -156,14 +208,25 @@ def cleanup_old_fire_alerts(days_to_keep=90):
     try:
         cutoff_date = timezone.now() - timedelta(days=days_to_keep)
         
-        # Delete old resolved fire alerts
-        deleted_count, _ = Alert.objects.filter(
+        old_alerts = Alert.objects.filter(
             alert_type='fire',
             resolved_at__isnull=False,
             resolved_at__lt=cutoff_date
-        ).delete()
-        
-        logger.info(f"Cleaned up {deleted_count} old fire alerts older than {cutoff_date.date()}")
+        ).order_by()
+        
+        # Delete old resolved fire alerts in batches with plain DELETE
+        # statements: nothing references alerts, so there is no cascade to
+        # collect and no per-row signals are needed, and short batches keep
+        # the table locks brief
+        deleted_count = 0
+        while True:
+            alert_ids = list(old_alerts.values_list('id', flat=True)[:CLEANUP_BATCH_SIZE])
+            if not alert_ids:
+                break
+            
+            deleted_count += Alert.objects.filter(id__in=alert_ids)._raw_delete(old_alerts.db)
+        
+        logger.info("Cleaned up %s old fire alerts older than %s", deleted_count, cutoff_date.date())
         
         return {
             'status': 'success',
@@ -172,7 +235,7 @@ def cleanup_old_fire_alerts(days_to_keep=90):
         }
         
     except Exception as e:
-        logger.error(f"Error cleaning up old fire alerts: {e}")
+        logger.error("Error cleaning up old fire alerts: %s", e)
         return {'status': 'error', 'message': str(e)}
 
 @shared_task
@@ -204,38 +267,48 @@ def daily_fire_monitoring():
         }
         
     except Exception as e:
-        logger.error(f"Error in daily fire monitoring: {e}")
+        logger.error("Error in daily fire monitoring: %s", e)
         return {'status': 'error', 'message': str(e)}
 
 @shared_task
-def send_fire_alert_notifications(alert_id):
+def send_fire_alert_notifications(alert_ids):
     """
     Send notifications for fire alerts (email, SMS, etc.).
     This is a placeholder for future notification implementation.
     
+    The alerts of a batch are loaded with one query (together with the
+    field, farm and owner to notify) so a bulk check sends one task per
+    batch instead of one per alert.
+    
     Args:
-        alert_id: UUID string of the alert
+        alert_ids: UUID string of an alert, or a list of them
     """
+    if isinstance(alert_ids, str):
+        alert_ids = [alert_ids]
+    
     try:
-        alert = Alert.objects.get(id=alert_id, alert_type='fire')
+        alerts = list(Alert.objects.filter(
+            id__in=alert_ids, alert_type='fire'
+        ).select_related('field__farm__owner'))
+        
+        if not alerts:
+            logger.error("Alerts %s not found", alert_ids)
+            return {'status': 'error', 'message': 'Alert not found'}
         
         # Placeholder for notification logic
         # This could integrate with email services, SMS providers, etc.
         
-        logger.info(f"Fire alert notification sent for alert {alert_id}")
+        for alert in alerts:
+            logger.info("Fire alert notification sent for alert %s", alert.id)
         
         return {
             'status': 'success',
-            'alert_id': alert_id,
+            'alert_ids': [str(alert.id) for alert in alerts],
             'notification_sent': True
         }
         
-    except Alert.DoesNotExist:
-        logger.error(f"Alert {alert_id} not found")
-        return {'status': 'error', 'message': 'Alert not found'}
-    
     except Exception as e:
-        logger.error(f"Error sending fire alert notification: {e}")
+        logger.error("Error sending fire alert notifications: %s", e)
         return {'status': 'error', 'message': str(e)}
 
 def _create_fire_alert(field, risk_data):
@@ -249,77 +322,185 @@ def _create_fire_alert(field, risk_data):
     Returns:
         True if alert was created, False otherwise
     """
+    return field.id in _create_fire_alerts([(field, risk_data)])
+
+def _create_fire_alerts(field_risks):
+    """
+    Create fire alerts for a batch of fields with one duplicate check query
+    and one bulk INSERT.
+    
+    Args:
+        field_risks: List of (Field instance, risk assessment data) pairs
+        
+    Returns:
+        Set of ids of the fields an alert was created for
+    """
+    if not field_risks:
+        return set()
+    
     try:
-        # Check if there's already a recent unresolved fire alert for this field
-        recent_cutoff = timezone.now() - timedelta(hours=6)  # Don't spam alerts
-        existing_alert = Alert.objects.filter(
-            field=field,
-            alert_type='fire',
-            resolved_at__isnull=True,
-            created_at__gte=recent_cutoff
-        ).first()
-        
-        if existing_alert:
-            logger.info(f"Recent fire alert already exists for field {field.id}")
-            return False
-        
-        # Determine severity based on risk level and score
-        risk_level = risk_data['risk_level']
-        risk_score = risk_data['risk_score']
-        
-        if risk_level == 'high' or risk_score >= 70:
-            severity = 'high'
-        elif risk_level == 'medium' or risk_score >= 40:
-            severity = 'medium'
-        else:
-            severity = 'low'
+        # Skip fields that already have a recent unresolved fire alert
+        recent_field_ids = _recent_fire_alert_field_ids([field.id for field, _ in field_risks])
         
-        # Create alert title and message
-        total_fires = risk_data['total_fires']
-        closest_distance = risk_data.get('closest_distance_km')
+        alerts = []
+        for field, risk_data in field_risks:
+            if field.id in recent_field_ids:
+                logger.info("Recent fire alert already exists for field %s", field.id)
+                continue
+            alerts.append(_build_fire_alert(field, risk_data))
         
-        if closest_distance and closest_distance <= 5:
-            title = f"🔥 URGENT: Fire detected within {closest_distance:.1f}km of {field.name}"
-        else:
-            title = f"🔥 Fire Alert: {total_fires} fire(s) detected near {field.name}"
+        if not alerts:
+            return set()
         
-        message_parts = [
-            f"Fire risk level: {risk_level.upper()}",
-            f"Risk score: {risk_score}/100",
-            f"Total fires detected: {total_fires}"
-        ]
+        Alert.objects.bulk_create(alerts, batch_size=500)
         
-        if closest_distance:
-            message_parts.append(f"Closest fire: {closest_distance:.1f}km away")
+        # bulk_create() bypasses post_save, so drop the owners' cached stats here
+        cache.delete_many({user_stats_cache_key(alert.field.farm.owner_id) for alert in alerts})
+        invalidate_farm_stats(alert.farm_id for alert in alerts)
         
-        fires_within_5km = risk_data.get('fires_within_5km', 0)
-        if fires_within_5km > 0:
-            message_parts.append(f"Fires within 5km: {fires_within_5km}")
+        for alert in alerts:
+            logger.info("Fire alert created: %s for field %s (severity: %s)", alert.id, alert.field_id, alert.severity)
         
-        message = "\n".join(message_parts)
+        # Trigger one notification task for the whole batch (async)
+        send_fire_alert_notifications.delay([str(alert.id) for alert in alerts])
         
-        # Create the alert
-        alert = Alert.objects.create(
-            field=field,
-            alert_type='fire',
-            severity=severity,
-            title=title,
-            message=message,
-            metadata={
-                'risk_assessment': risk_data,
-                'buffer_km': risk_data.get('buffer_km', 10),
-                'analysis_period_days': risk_data.get('analysis_period_days', 7),
-                'created_by_task': True
-            }
-        )
+        return {alert.field_id for alert in alerts}
         
-        logger.info(f"Fire alert created: {alert.id} for field {field.id} (severity: {severity})")
+    except DatabaseError as e:
+        logger.error("Error creating fire alerts for %s field(s): %s", len(field_risks), e)
+        return set()
+
+def _recent_fire_alert_field_ids(field_ids):
+    """
+    Return the ids of the fields that already have a recent unresolved fire alert.
+    """
+    recent_cutoff = timezone.now() - timedelta(hours=6)  # Don't spam alerts
+    recent_alerts = Alert.objects.filter(
+        field_id__in=field_ids,
+        alert_type='fire',
+        resolved_at__isnull=True,
+        created_at__gte=recent_cutoff
+    )
+    
+    # A single field only needs a presence check, not the matching rows
+    if len(field_ids) == 1:
+        return set(field_ids) if recent_alerts.exists() else set()
+    
+    return set(recent_alerts.values_list('field_id', flat=True).distinct())
+
+def _build_fire_alert(field, risk_data):
+    """
+    Build an unsaved fire alert for a field based on risk assessment data.
+    
+    Args:
+        field: Field model instance
+        risk_data: Risk assessment data from NASA FIRMS API
         
-        # Trigger notification task (async)
-        send_fire_alert_notifications.delay(str(alert.id))
+    Returns:
+        Unsaved Alert instance
+    """
+    # Determine severity based on risk level and score
+    risk_level = risk_data['risk_level']
+    risk_score = risk_data['risk_score']
+    
+    if risk_level == 'high' or risk_score >= 70:
+        severity = 'high'
+    elif risk_level == 'medium' or risk_score >= 40:
+        severity = 'medium'
+    else:
+        severity = 'low'
+    
+    # Create alert title and description
+    total_fires = risk_data['total_fires']
+    closest_distance = risk_data.get('closest_distance_km')
+    
+    if closest_distance and closest_distance <= 5:
+        title = f"🔥 URGENT: Fire detected within {closest_distance:.1f}km of {field.name}"
+    else:
+        title = f"🔥 Fire Alert: {total_fires} fire(s) detected near {field.name}"
+    
+    description_parts = [
+        f"Fire risk level: {risk_level.upper()}",
+        f"Risk score: {risk_score}/100",
+        f"Total fires detected: {total_fires}"
+    ]
+    
+    if closest_distance:
+        description_parts.append(f"Closest fire: {closest_distance:.1f}km away")
+    
+    fires_within_5km = risk_data.get('fires_within_5km', 0)
+    if fires_within_5km > 0:
+        description_parts.append(f"Fires within 5km: {fires_within_5km}")
+    
+    description_parts.append(
+        f"Searched within {risk_data.get('buffer_km', 10)}km over the last "
+        f"{risk_data.get('analysis_period_days', 7)} days"
+    )
+    
+    description = "\n".join(description_parts)
+    
+    return Alert(
+        field=field,
+        farm_id=field.farm_id,
+        alert_type='fire',
+        severity=severity,
+        title=title,
+        description=description
+    )
+
+def _assess_field_fire_risk(field, nasa_api, buffer_km):
+    """
+    Assess the fire risk around a field.
+    
+    Args:
+        field: Field model instance
+        nasa_api: NASAFirmsAPI client
+        buffer_km: Buffer distance in kilometers around the field
         
-        return True
+    Returns:
+        Tuple of (result dictionary for the field, risk assessment data or
+        None if the assessment failed)
         
-    except Exception as e:
-        logger.error(f"Error creating fire alert for field {field.id}: {e}")
-        return False
\ No newline at end of file
+    Raises:
+        requests.RequestException: FIRMS could not be reached (transient)
+    """
+    field_id = str(field.id)
+    
+    if field.centroid is None:
+        logger.warning("Field %s has no boundary", field_id)
+        return {'status': 'error', 'field_id': field_id, 'message': 'Field has no geographic boundary'}, None
+    
+    # Get fire risk assessment around the precomputed centroid
+    risk_data = nasa_api.get_fire_risk_assessments(
+        [field.centroid], buffer_km, days_back=7
+    )[0]
+    
+    if risk_data.get('retryable'):
+        # The client reports FIRMS outages as error results; raise them so
+        # the calling task's autoretry_for backoff applies
+        raise requests.RequestException(risk_data['error'])
+    
+    result = _fire_check_result(field, risk_data)
+    return result, (risk_data if result['status'] == 'success' else None)
+
+def _fire_check_result(field, risk_data):
+    """
+    Build the result dictionary of a fire check from the field's risk assessment.
+    """
+    field_id = str(field.id)
+    
+    if 'error' in risk_data:
+        logger.error("Failed to get fire risk for field %s: %s", field_id, risk_data['error'])
+        return {'status': 'error', 'field_id': field_id, 'message': risk_data['error']}
+    
+    result = {
+        'status': 'success',
+        'field_id': field_id,
+        'risk_level': risk_data['risk_level'],
+        'risk_score': risk_data['risk_score'],
+        'total_fires': risk_data['total_fires'],
+        'alerts_created': 0
+    }
+    
+    logger.info("Fire check completed for field %s: %s", field_id, result)
+    return result
\ No newline at end of file
@@ -1,12 +1,18 @@
 from rest_framework.decorators import api_view, permission_classes
+from rest_framework.pagination import LimitOffsetPagination
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 from rest_framework import status
 # from django.contrib.gis.measure import Distance  # Temporarily disabled
+from django.core.cache import cache
+from django.db.models import Count, Q, TextField, Value
+from django.db.models.functions import Concat
 from django.utils import timezone
 from datetime import datetime, timedelta
+from apps.authentication.signals import user_stats_cache_key
 from apps.fields.models import Field, Alert
-from .nasa_firms_api import NASAFirmsAPI
+from apps.fields.signals import invalidate_farm_stats
+from .nasa_firms_api import NASA_FIRMS_CLIENT as nasa_api
 from .tasks import check_fire_alerts_for_field, check_fire_alerts_for_all_fields
 import logging
 
@@ -33,7 +39,7 @@ def get_field_fire_data(request, field_id):
                 status=status.HTTP_403_FORBIDDEN
             )
         
-        if not field.boundary:
+        if field.centroid is None:
             return Response(
                 {'error': 'Field has no geographic boundary'},
                 status=status.HTTP_400_BAD_REQUEST
@@ -57,10 +63,10 @@ def get_field_fire_data(request, field_id):
                 status=status.HTTP_400_BAD_REQUEST
             )
         
-        # Get fire risk assessment
-        nasa_api = NASAFirmsAPI()
+        # Get fire risk assessment around the precomputed centroid
+        latitude, longitude = field.centroid
         risk_data = nasa_api.get_fire_risk_assessment(
-            field.boundary, buffer_km, days_back
+            latitude, longitude, buffer_km, days_back
         )
         
         if 'error' in risk_data:
@@ -91,7 +97,7 @@ def get_field_fire_data(request, field_id):
             status=status.HTTP_400_BAD_REQUEST
         )
     except Exception as e:
-        logger.error(f"Error getting fire data for field {field_id}: {e}")
+        logger.error("Error getting fire data for field %s: %s", field_id, e)
         return Response(
             {'error': 'Internal server error'},
             status=status.HTTP_500_INTERNAL_SERVER_ERROR
@@ -139,7 +145,7 @@ def check_fire_alerts(request, field_id):
             status=status.HTTP_404_NOT_FOUND
         )
     except Exception as e:
-        logger.error(f"Error initiating fire alert check for field {field_id}: {e}")
+        logger.error("Error initiating fire alert check for field %s: %s", field_id, e)
         return Response(
             {'error': 'Internal server error'},
             status=status.HTTP_500_INTERNAL_SERVER_ERROR
@@ -156,6 +162,7 @@ def get_fire_alerts(request):
     - severity: Filter by severity (low, medium, high, critical)
     - resolved: Filter by resolution status (true, false)
     - field_id: Filter by specific field ID
+    - limit, offset: Pagination (default limit: PAGE_SIZE)
     """
     try:
         # Get query parameters
@@ -166,7 +173,7 @@ def get_fire_alerts(request):
         
         # Base query for user's alerts
         alerts = Alert.objects.filter(
-            field__farm__owner=request.user,
+            farm__owner=request.user,
             alert_type='fire'
         )
         
@@ -179,38 +186,44 @@ def get_fire_alerts(request):
             alerts = alerts.filter(severity=severity)
         
         if resolved is not None:
-            if resolved.lower() == 'true':
-                alerts = alerts.filter(resolved_at__isnull=False)
-            else:
-                alerts = alerts.filter(resolved_at__isnull=True)
+            alerts = alerts.filter(is_resolved=resolved.lower() == 'true')
         
         if field_id:
             alerts = alerts.filter(field_id=field_id)
         
-        # Order by creation date (newest first)
-        alerts = alerts.order_by('-created_at')
-        
-        # Serialize alerts
-        alert_data = []
-        for alert in alerts:
-            alert_data.append({
-                'id': str(alert.id),
-                'field_id': str(alert.field.id),
-                'field_name': alert.field.name,
-                'farm_name': alert.field.farm.name,
-                'alert_type': alert.alert_type,
-                'severity': alert.severity,
-                'title': alert.title,
-                'message': alert.message,
-                'metadata': alert.metadata,
-                'created_at': alert.created_at.isoformat(),
-                'resolved_at': alert.resolved_at.isoformat() if alert.resolved_at else None,
-                'is_resolved': alert.resolved_at is not None
-            })
+        # Order by creation date (newest first); plain rows (joined with the
+        # field and farm names) are enough, no model instances needed
+        alerts = alerts.order_by('-created_at').values(
+            'id', 'field_id', 'field__name', 'farm__name', 'alert_type',
+            'severity', 'title', 'description', 'created_at', 'resolved_at', 'is_resolved'
+        )
+        
+        paginator = LimitOffsetPagination()
+        page = paginator.paginate_queryset(alerts, request)
+        
+        # Serialize alerts (UUIDs and datetimes are encoded by the renderer)
+        alert_data = [
+            {
+                'id': row['id'],
+                'field_id': row['field_id'],
+                'field_name': row['field__name'],
+                'farm_name': row['farm__name'],
+                'alert_type': row['alert_type'],
+                'severity': row['severity'],
+                'title': row['title'],
+                'description': row['description'],
+                'created_at': row['created_at'],
+                'resolved_at': row['resolved_at'],
+                'is_resolved': row['is_resolved']
+            }
+            for row in page
+        ]
         
         return Response({
             'alerts': alert_data,
-            'total_count': len(alert_data),
+            'total_count': paginator.count,
+            'next': paginator.get_next_link(),
+            'previous': paginator.get_previous_link(),
             'filters_applied': {
                 'days_back': days_back,
                 'severity': severity,
@@ -225,7 +238,47 @@ def get_fire_alerts(request):
             status=status.HTTP_400_BAD_REQUEST
         )
     except Exception as e:
-        logger.error(f"Error getting fire alerts for user {request.user.id}: {e}")
+        logger.error("Error getting fire alerts for user %s: %s", request.user.id, e)
+        return Response(
+            {'error': 'Internal server error'},
+            status=status.HTTP_500_INTERNAL_SERVER_ERROR
+        )
+
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+def get_fire_alert(request, alert_id):
+    """
+    Get a single fire alert, including its risk assessment summary.
+    """
+    try:
+        alert = Alert.objects.select_related('field', 'farm', 'resolved_by').get(
+            id=alert_id,
+            farm__owner=request.user,
+            alert_type='fire'
+        )
+        
+        return Response({
+            'id': str(alert.id),
+            'field_id': str(alert.field_id),
+            'field_name': alert.field.name,
+            'farm_name': alert.farm.name,
+            'alert_type': alert.alert_type,
+            'severity': alert.severity,
+            'title': alert.title,
+            'description': alert.description,
+            'created_at': alert.created_at.isoformat(),
+            'resolved_at': alert.resolved_at.isoformat() if alert.resolved_at else None,
+            'resolved_by': alert.resolved_by.username if alert.resolved_by else None,
+            'is_resolved': alert.is_resolved
+        })
+        
+    except Alert.DoesNotExist:
+        return Response(
+            {'error': 'Alert not found or access denied'},
+            status=status.HTTP_404_NOT_FOUND
+        )
+    except Exception as e:
+        logger.error("Error getting fire alert %s: %s", alert_id, e)
         return Response(
             {'error': 'Internal server error'},
             status=status.HTTP_500_INTERNAL_SERVER_ERROR
@@ -241,35 +294,45 @@ def resolve_fire_alert(request, alert_id):
     - resolution_notes: Optional notes about the resolution
     """
     try:
-        alert = Alert.objects.get(
+        user_alerts = Alert.objects.filter(
             id=alert_id,
-            field__farm__owner=request.user,
+            farm__owner=request.user,
             alert_type='fire'
         )
+        unresolved = user_alerts.unresolved()
         
-        if alert.resolved_at:
-            return Response(
-                {'error': 'Alert is already resolved'},
-                status=status.HTTP_400_BAD_REQUEST
-            )
-        
-        # Mark as resolved
-        alert.resolved_at = timezone.now()
+        # Mark as resolved with a single conditional UPDATE, the same state
+        # change AlertQuerySet.resolve() makes
+        resolved_at = timezone.now()
+        updates = {'is_resolved': True, 'resolved_at': resolved_at, 'resolved_by': request.user}
         
         # Add resolution notes if provided
         resolution_notes = request.data.get('resolution_notes')
         if resolution_notes:
-            if not alert.metadata:
-                alert.metadata = {}
-            alert.metadata['resolution_notes'] = resolution_notes
-            alert.metadata['resolved_by'] = request.user.username
+            updates['description'] = Concat(
+                'description',
+                Value(f"\n\nResolution notes ({request.user.username}): {resolution_notes}"),
+                output_field=TextField()
+            )
+        
+        updated = unresolved.update(**updates)
+        
+        if not updated:
+            if user_alerts.exists():
+                return Response(
+                    {'error': 'Alert is already resolved'},
+                    status=status.HTTP_400_BAD_REQUEST
+                )
+            raise Alert.DoesNotExist
         
-        alert.save()
+        # update() sends no post_save, so drop the owner's cached stats here
+        cache.delete(user_stats_cache_key(request.user.id))
+        invalidate_farm_stats(user_alerts.values_list('farm_id', flat=True))
         
         return Response({
             'message': 'Alert marked as resolved',
-            'alert_id': str(alert.id),
-            'resolved_at': alert.resolved_at.isoformat()
+            'alert_id': str(alert_id),
+            'resolved_at': resolved_at.isoformat()
         })
         
     except Alert.DoesNotExist:
@@ -278,7 +341,7 @@ def resolve_fire_alert(request, alert_id):
             status=status.HTTP_404_NOT_FOUND
         )
     except Exception as e:
-        logger.error(f"Error resolving fire alert {alert_id}: {e}")
+        logger.error("Error resolving fire alert %s: %s", alert_id, e)
         return Response(
             {'error': 'Internal server error'},
             status=status.HTTP_500_INTERNAL_SERVER_ERROR
@@ -299,10 +362,8 @@ def bulk_check_fire_alerts(request):
         buffer_km = request.data.get('buffer_km', 10)
         create_alerts = request.data.get('create_alerts', True)
         
-        # Get user's fields count
-        user_fields_count = Field.objects.filter(farm__owner=request.user).count()
-        
-        if user_fields_count == 0:
+        # Only check whether the user has any fields; the task counts them
+        if not Field.objects.filter(farm__owner=request.user).exists():
             return Response(
                 {'error': 'No fields found for this user'},
                 status=status.HTTP_404_NOT_FOUND
@@ -316,12 +377,11 @@ def bulk_check_fire_alerts(request):
         return Response({
             'message': 'Bulk fire alert check initiated',
             'task_id': task.id,
-            'fields_count': user_fields_count,
             'buffer_km': buffer_km
         })
         
     except Exception as e:
-        logger.error(f"Error initiating bulk fire alert check for user {request.user.id}: {e}")
+        logger.error("Error initiating bulk fire alert check for user %s: %s", request.user.id, e)
         return Response(
             {'error': 'Internal server error'},
             status=status.HTTP_500_INTERNAL_SERVER_ERROR
@@ -340,33 +400,42 @@ def get_fire_statistics(request):
         days_back = int(request.GET.get('days_back', 30))
         cutoff_date = timezone.now() - timedelta(days=days_back)
         
-        # Get user's fire alerts
-        fire_alerts = Alert.objects.filter(
-            field__farm__owner=request.user,
+        # Recent alerts (last 7 days)
+        recent_cutoff = timezone.now() - timedelta(days=7)
+        
+        # Calculate statistics of the user's fire alerts in a single query
+        stats = Alert.objects.filter(
+            farm__owner=request.user,
             alert_type='fire',
             created_at__gte=cutoff_date
+        ).aggregate(
+            total=Count('id'),
+            resolved=Count('id', filter=Q(resolved_at__isnull=False)),
+            low=Count('id', filter=Q(severity='low')),
+            medium=Count('id', filter=Q(severity='medium')),
+            high=Count('id', filter=Q(severity='high')),
+            critical=Count('id', filter=Q(severity='critical')),
+            affected_fields=Count('field', distinct=True),
+            recent=Count('id', filter=Q(created_at__gte=recent_cutoff))
         )
         
-        # Calculate statistics
-        total_alerts = fire_alerts.count()
-        resolved_alerts = fire_alerts.filter(resolved_at__isnull=False).count()
+        total_alerts = stats['total']
+        resolved_alerts = stats['resolved']
         unresolved_alerts = total_alerts - resolved_alerts
         
         # Group by severity
         severity_stats = {
-            'low': fire_alerts.filter(severity='low').count(),
-            'medium': fire_alerts.filter(severity='medium').count(),
-            'high': fire_alerts.filter(severity='high').count(),
-            'critical': fire_alerts.filter(severity='critical').count()
+            'low': stats['low'],
+            'medium': stats['medium'],
+            'high': stats['high'],
+            'critical': stats['critical']
         }
         
         # Get affected fields
-        affected_fields = fire_alerts.values('field').distinct().count()
+        affected_fields = stats['affected_fields']
         total_fields = Field.objects.filter(farm__owner=request.user).count()
         
-        # Recent alerts (last 7 days)
-        recent_cutoff = timezone.now() - timedelta(days=7)
-        recent_alerts = fire_alerts.filter(created_at__gte=recent_cutoff).count()
+        recent_alerts = stats['recent']
         
         return Response({
             'period_days': days_back,
@@ -388,7 +457,7 @@ def get_fire_statistics(request):
             status=status.HTTP_400_BAD_REQUEST
         )
     except Exception as e:
-        logger.error(f"Error getting fire statistics for user {request.user.id}: {e}")
+        logger.error("Error getting fire statistics for user %s: %s", request.user.id, e)
         return Response(
             {'error': 'Internal server error'},
             status=status.HTTP_500_INTERNAL_SERVER_ERROR
@@ -1,12 +1,49 @@
 from django.contrib import admin
+from django.core.paginator import Paginator
+from django.db import connections
+from django.utils.functional import cached_property
 # from django.contrib.gis.admin import OSMGeoAdmin  # Temporarily disabled
 from .models import Farm, Field, CropHealth, WeatherData, SoilMoisture, SatelliteImage, Alert
 
+class ApproxCountPaginator(Paginator):
+    """
+    Paginator that reads the planner's row estimate from pg_class for
+    unfiltered PostgreSQL changelists instead of running COUNT(*).
+    """
+    
+    @cached_property
+    def count(self):
+        queryset = self.object_list
+        connection = connections[queryset.db]
+        if connection.vendor == 'postgresql' and not queryset.query.where:
+            with connection.cursor() as cursor:
+                cursor.execute(
+                    "SELECT reltuples FROM pg_class WHERE relname = %s",
+                    [queryset.model._meta.db_table]
+                )
+                row = cursor.fetchone()
+            # reltuples is -1 (or 0) until the table has been analyzed
+            if row and row[0] > 0:
+                return int(row[0])
+        return super().count
+
+ADMIN_UPDATE_BATCH_SIZE = 1000
+
+def _pk_batches(queryset, batch_size=ADMIN_UPDATE_BATCH_SIZE):
+    """
+    Split an admin action selection into querysets of at most batch_size
+    primary keys, so "select all" does not turn into one huge IN list.
+    """
+    pks = list(queryset.values_list('pk', flat=True).iterator(chunk_size=10000))
+    for start in range(0, len(pks), batch_size):
+        yield queryset.model.objects.filter(pk__in=pks[start:start + batch_size])
+
 # Temporarily disable admin registrations to fix field reference errors
 
 # @admin.register(Farm)
 class FarmAdmin(admin.ModelAdmin):
     list_display = ['name', 'owner', 'total_area_hectares', 'location', 'created_at']
+    list_select_related = ('owner',)
     list_filter = ['created_at', 'updated_at']
     search_fields = ['name', 'owner__username', 'owner__email']
     readonly_fields = ['created_at', 'updated_at']
@@ -26,6 +63,7 @@ class FarmAdmin(admin.ModelAdmin):
 # @admin.register(Field)
 class FieldAdmin(admin.ModelAdmin):
     list_display = ['name', 'farm', 'crop_type', 'growth_stage', 'area_hectares', 'is_active']
+    list_select_related = ('farm__owner',)
     list_filter = ['crop_type', 'growth_stage', 'is_active', 'planting_date']
     search_fields = ['name', 'farm__name', 'crop_type']
     readonly_fields = ['created_at', 'updated_at']
@@ -50,6 +88,9 @@ class FieldAdmin(admin.ModelAdmin):
 # @admin.register(CropHealth)
 class CropHealthAdmin(admin.ModelAdmin):
     list_display = ['field', 'status', 'health_score', 'ndvi_value', 'data_source', 'measured_at']
+    list_select_related = ('field',)
+    show_full_result_count = False
+    paginator = ApproxCountPaginator
     list_filter = ['status', 'data_source', 'measured_at']
     search_fields = ['field__name', 'field__farm__name']
     readonly_fields = ['created_at', 'updated_at']
@@ -70,10 +111,20 @@ class CropHealthAdmin(admin.ModelAdmin):
             'classes': ('collapse',)
         })
     )
+    
+    def get_queryset(self, request):
+        # The changelist only renders these columns; skip the rest of the row
+        return super().get_queryset(request).only(
+            'id', 'status', 'health_score', 'ndvi_value', 'data_source', 'measured_at',
+            'field__name', 'field__crop_type'
+        )
 
 # @admin.register(WeatherData)
 class WeatherDataAdmin(admin.ModelAdmin):
     list_display = ['field', 'weather_date', 'temperature_min', 'temperature_max', 'precipitation', 'data_source']
+    list_select_related = ('field',)
+    show_full_result_count = False
+    paginator = ApproxCountPaginator
     list_filter = ['data_source', 'weather_date']
     search_fields = ['field__name', 'field__farm__name']
     readonly_fields = ['created_at', 'updated_at']
@@ -97,6 +148,9 @@ class WeatherDataAdmin(admin.ModelAdmin):
 # @admin.register(SoilMoisture)
 class SoilMoistureAdmin(admin.ModelAdmin):
     list_display = ['field', 'moisture_level', 'depth_cm', 'data_source', 'measured_at']
+    list_select_related = ('field',)
+    show_full_result_count = False
+    paginator = ApproxCountPaginator
     list_filter = ['data_source', 'depth_cm', 'measured_at']
     search_fields = ['field__name', 'field__farm__name']
     readonly_fields = ['created_at', 'updated_at']
@@ -117,6 +171,9 @@ class SoilMoistureAdmin(admin.ModelAdmin):
 # @admin.register(SatelliteImage)
 class SatelliteImageAdmin(admin.ModelAdmin):
     list_display = ['field', 'satellite', 'image_type', 'cloud_coverage', 'captured_at']
+    list_select_related = ('field',)
+    show_full_result_count = False
+    paginator = ApproxCountPaginator
     list_filter = ['satellite', 'image_type', 'captured_at']
     search_fields = ['field__name', 'field__farm__name', 'satellite']
     readonly_fields = ['created_at', 'updated_at']
@@ -137,9 +194,19 @@ class SatelliteImageAdmin(admin.ModelAdmin):
             'classes': ('collapse',)
         })
     )
+    
+    def get_queryset(self, request):
+        # Leave the metadata JSON and image URLs out of the changelist query
+        return super().get_queryset(request).only(
+            'id', 'satellite_source', 'cloud_coverage', 'captured_at',
+            'field__name', 'field__crop_type'
+        )
 # @admin.register(Alert)
 class AlertAdmin(admin.ModelAdmin):
     list_display = ['field', 'alert_type', 'severity', 'is_resolved', 'created_at']
+    list_select_related = ('field',)
+    show_full_result_count = False
+    paginator = ApproxCountPaginator
     list_filter = ['alert_type', 'severity', 'is_resolved', 'created_at']
     search_fields = ['field__name', 'field__farm__name', 'title', 'message']
     readonly_fields = ['created_at', 'updated_at']
@@ -160,11 +227,14 @@ class AlertAdmin(admin.ModelAdmin):
     )
     
     def mark_as_resolved(self, request, queryset):
-        updated = queryset.update(is_resolved=True, resolved_by=request.user)
+        updated = sum(batch.resolve(user=request.user) for batch in _pk_batches(queryset))
         self.message_user(request, f'{updated} alerts marked as resolved.')
     mark_as_resolved.short_description = "Mark selected alerts as resolved"
     
     def mark_as_unresolved(self, request, queryset):
-        updated = queryset.update(is_resolved=False, resolved_by=None, resolved_at=None)
+        updated = sum(
+            batch.update(is_resolved=False, resolved_by=None, resolved_at=None)
+            for batch in _pk_batches(queryset)
+        )
         self.message_user(request, f'{updated} alerts marked as unresolved.')
     mark_as_unresolved.short_description = "Mark selected alerts as unresolved"
\ No newline at end of file
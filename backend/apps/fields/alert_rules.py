@@ -0,0 +1,140 @@
+"""
+Threshold alerts for newly ingested field readings.
+
+Readings are evaluated a batch at a time: every rule is one vectorized
+comparison over a column of the batch, and all alerts the batch raises are
+written with a single bulk_create().
+"""
+import operator
+from collections import namedtuple
+
+import numpy as np
+from django.core.cache import cache
+from apps.authentication.signals import user_stats_cache_key
+from .models import Alert, CropHealth, Field, SoilMoisture, WeatherData
+from .signals import invalidate_farm_stats
+
+AlertRule = namedtuple('AlertRule', [
+    'column', 'compare', 'threshold', 'alert_type', 'severity', 'title', 'description'
+])
+
+ALERT_RULES = {
+    CropHealth: (
+        AlertRule(
+            'status', operator.eq, 'poor', 'health', 'high',
+            'Poor Crop Health Detected in {field_name}',
+            'Crop health status has changed to poor. NDVI: {r.ndvi_value}, Health Score: {r.health_score}'
+        ),
+        AlertRule(
+            'status', operator.eq, 'critical', 'health', 'critical',
+            'Critical Crop Health in {field_name}',
+            'Crop health is critical and requires immediate attention. NDVI: {r.ndvi_value}, Health Score: {r.health_score}'
+        ),
+    ),
+    WeatherData: (
+        AlertRule(
+            'temperature_max', operator.gt, 40, 'weather', 'high',
+            'Extreme Heat Warning for {field_name}',
+            'Maximum temperature reached {r.temperature_max}°C on {r.weather_date}'
+        ),
+        AlertRule(
+            'temperature_min', operator.lt, 0, 'weather', 'high',
+            'Frost Warning for {field_name}',
+            'Minimum temperature dropped to {r.temperature_min}°C on {r.weather_date}'
+        ),
+        AlertRule(
+            'precipitation', operator.gt, 50, 'weather', 'medium',
+            'Heavy Rainfall Alert for {field_name}',
+            'Heavy rainfall of {r.precipitation}mm recorded on {r.weather_date}'
+        ),
+    ),
+    SoilMoisture: (
+        AlertRule(
+            'moisture_percentage', operator.lt, 20, 'irrigation', 'medium',
+            'Low Soil Moisture in {field_name}',
+            'Soil moisture level is {r.moisture_percentage}% at {r.depth_cm}cm depth. Consider irrigation.'
+        ),
+        AlertRule(
+            'moisture_percentage', operator.gt, 80, 'irrigation', 'low',
+            'High Soil Moisture in {field_name}',
+            'Soil moisture level is {r.moisture_percentage}% at {r.depth_cm}cm depth. Monitor for waterlogging.'
+        ),
+    ),
+}
+
+def _column(readings, name, threshold):
+    values = [getattr(reading, name) for reading in readings]
+    if isinstance(threshold, str):
+        return np.array(values, dtype=object)
+    # Missing readings become NaN, which never crosses a threshold
+    return np.array(values, dtype=np.float64)
+
+def _threshold_masks(readings, rules):
+    """
+    Evaluate every rule over the batch at once.
+    
+    Returns:
+        Boolean array of shape (len(readings), len(rules)) that is True
+        where a reading crosses a rule's threshold
+    """
+    columns = {}
+    masks = np.empty((len(readings), len(rules)), dtype=bool)
+    for index, rule in enumerate(rules):
+        if rule.column not in columns:
+            columns[rule.column] = _column(readings, rule.column, rule.threshold)
+        masks[:, index] = rule.compare(columns[rule.column], rule.threshold)
+    return masks
+
+def evaluate_alerts_for_batch(readings):
+    """
+    Raise the threshold alerts for a batch of newly created readings.
+    
+    Args:
+        readings: CropHealth, WeatherData or SoilMoisture instances, all of
+            the same model
+    
+    Returns:
+        List of the created Alert instances
+    """
+    readings = list(readings)
+    if not readings:
+        return []
+    
+    rules = ALERT_RULES[type(readings[0])]
+    # Only the flagged (reading, rule) pairs are touched from here on,
+    # in reading order
+    row_indices, rule_indices = np.nonzero(_threshold_masks(readings, rules))
+    if not len(row_indices):
+        return []
+    flagged = [
+        (readings[row], rules[rule])
+        for row, rule in zip(row_indices.tolist(), rule_indices.tolist())
+    ]
+    
+    fields = {
+        field_id: (name, farm_id, owner_id)
+        for field_id, name, farm_id, owner_id in Field.objects.filter(
+            pk__in={reading.field_id for reading, _ in flagged}
+        ).values_list('id', 'name', 'farm_id', 'farm__owner_id')
+    }
+    
+    alerts = []
+    for reading, rule in flagged:
+        field_name, farm_id, _ = fields[reading.field_id]
+        alerts.append(Alert(
+            field_id=reading.field_id,
+            farm_id=farm_id,
+            alert_type=rule.alert_type,
+            severity=rule.severity,
+            title=rule.title.format(field_name=field_name),
+            description=rule.description.format(r=reading)
+        ))
+    Alert.objects.bulk_create(alerts)
+    
+    # bulk_create() bypasses post_save, so drop the owners' cached stats here
+    cache.delete_many({
+        user_stats_cache_key(fields[alert.field_id][2]) for alert in alerts
+    })
+    invalidate_farm_stats(alert.farm_id for alert in alerts)
+    
+    return alerts
\ No newline at end of file
@@ -1,33 +1,57 @@
 import django_filters
-from django.db.models import Q
+from django.db.models import Q, Exists, OuterRef
 from .models import Field, CropHealth, Alert, WeatherData
 
-class FieldFilter(django_filters.FilterSet):
-    crop_type = django_filters.ChoiceFilter(choices=Field.CROP_CHOICES)
-    growth_stage = django_filters.ChoiceFilter(choices=Field.GROWTH_STAGES)
+# Bound once at import so the filter definitions share the same tuples
+_CROP_CHOICES = tuple(Field.CROP_CHOICES)
+_GROWTH_CHOICES = tuple(Field.GROWTH_STAGES)
+_HEALTH_STATUS_CHOICES = tuple(CropHealth.HEALTH_STATUS)
+
+class FastFilterSet(django_filters.FilterSet):
+    """
+    FilterSet that skips form validation and filtering entirely when none
+    of its filters were given a value.
+    """
+    
+    def has_filter_values(self):
+        return any(self.data.get(name) not in (None, '', []) for name in self.filters)
+    
+    def is_valid(self):
+        if not self.has_filter_values():
+            return True
+        return super().is_valid()
+    
+    @property
+    def qs(self):
+        if not self.has_filter_values():
+            return self.queryset.all()
+        return super().qs
+
+class FieldFilter(FastFilterSet):
+    crop_type = django_filters.ChoiceFilter(choices=_CROP_CHOICES)
+    growth_stage = django_filters.ChoiceFilter(choices=_GROWTH_CHOICES)
     area_min = django_filters.NumberFilter(field_name='area_hectares', lookup_expr='gte')
     area_max = django_filters.NumberFilter(field_name='area_hectares', lookup_expr='lte')
     planting_date_after = django_filters.DateFilter(field_name='planting_date', lookup_expr='gte')
     planting_date_before = django_filters.DateFilter(field_name='planting_date', lookup_expr='lte')
     has_alerts = django_filters.BooleanFilter(method='filter_has_alerts')
-    health_status = django_filters.CharFilter(method='filter_health_status')
+    health_status = django_filters.ChoiceFilter(choices=_HEALTH_STATUS_CHOICES, method='filter_health_status')
     
     class Meta:
         model = Field
         fields = ['crop_type', 'growth_stage', 'is_active']
     
     def filter_has_alerts(self, queryset, name, value):
-        if value:
-            return queryset.filter(alerts__is_resolved=False).distinct()
-        return queryset.exclude(alerts__is_resolved=False).distinct()
+        open_alerts = Exists(Alert.active.filter(field=OuterRef('pk')))
+        return queryset.filter(open_alerts if value else ~open_alerts)
     
     def filter_health_status(self, queryset, name, value):
         return queryset.filter(
-            health_data__status=value
-        ).distinct()
+            Exists(CropHealth.objects.filter(field=OuterRef('pk'), status=value))
+        )
 
-class CropHealthFilter(django_filters.FilterSet):
-    status = django_filters.ChoiceFilter(choices=CropHealth.HEALTH_STATUS)
+class CropHealthFilter(FastFilterSet):
+    status = django_filters.ChoiceFilter(choices=_HEALTH_STATUS_CHOICES)
     data_source = django_filters.ChoiceFilter(choices=CropHealth.DATA_SOURCES)
     measured_after = django_filters.DateTimeFilter(field_name='measured_at', lookup_expr='gte')
     measured_before = django_filters.DateTimeFilter(field_name='measured_at', lookup_expr='lte')
@@ -41,20 +65,20 @@ class CropHealthFilter(django_filters.FilterSet):
         model = CropHealth
         fields = ['status', 'data_source', 'field']
 
-class AlertFilter(django_filters.FilterSet):
+class AlertFilter(FastFilterSet):
     alert_type = django_filters.ChoiceFilter(choices=Alert.ALERT_TYPES)
     severity = django_filters.ChoiceFilter(choices=Alert.SEVERITY_LEVELS)
     is_resolved = django_filters.BooleanFilter()
     created_after = django_filters.DateTimeFilter(field_name='created_at', lookup_expr='gte')
     created_before = django_filters.DateTimeFilter(field_name='created_at', lookup_expr='lte')
     field = django_filters.UUIDFilter(field_name='field__id')
-    farm = django_filters.UUIDFilter(field_name='field__farm__id')
+    farm = django_filters.UUIDFilter(field_name='farm')
     
     class Meta:
         model = Alert
         fields = ['alert_type', 'severity', 'is_resolved', 'field', 'farm']
 
-class WeatherDataFilter(django_filters.FilterSet):
+class WeatherDataFilter(FastFilterSet):
     data_source = django_filters.ChoiceFilter(choices=WeatherData.DATA_SOURCES)
     weather_date_after = django_filters.DateFilter(field_name='weather_date', lookup_expr='gte')
     weather_date_before = django_filters.DateFilter(field_name='weather_date', lookup_expr='lte')
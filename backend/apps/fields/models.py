@@ -1,11 +1,54 @@
-from django.db import models
+from django.db import connections, models
+from django.db.models.functions import Cast, Coalesce, ExtractDay, Now, Round
+from django.contrib.postgres.indexes import GinIndex
 from django.contrib.auth.models import User
 from django.core.validators import MinValueValidator, MaxValueValidator
 from django.utils import timezone
+import json
+import os
+import time
 import uuid
+import numpy as np
+
+def uuid7():
+    """
+    Time-ordered UUID (RFC 9562 version 7): a 48-bit millisecond timestamp
+    followed by random bits, so new primary keys land at the right-hand
+    end of the index instead of on a random page.
+    """
+    timestamp_ms = time.time_ns() // 1_000_000
+    rand = int.from_bytes(os.urandom(10), 'big')
+    value = (
+        (timestamp_ms & 0xFFFFFFFFFFFF) << 80
+        | 0x7 << 76
+        | (rand >> 62 & 0xFFF) << 64
+        | 0x2 << 62
+        | rand & 0x3FFFFFFFFFFFFFFF
+    )
+    return uuid.UUID(int=value)
+
+class FarmQuerySet(models.QuerySet):
+    def with_stats(self):
+        """
+        Annotate the fields count, average health score and open alerts
+        count, so listing farms does not run extra queries per farm.
+        """
+        # Health readings and alerts are aggregated in correlated subqueries;
+        # joining them here would multiply the rows being grouped per farm
+        average_health = CropHealth.objects.filter(
+            field__farm=models.OuterRef('pk')
+        ).order_by().values('field__farm').annotate(avg=models.Avg('health_score')).values('avg')
+        open_alerts = Alert.active.filter(
+            farm=models.OuterRef('pk')
+        ).order_by().values('farm').annotate(count=models.Count('pk')).values('count')
+        return self.annotate(
+            annotated_fields_count=models.Count('fields'),
+            annotated_average_health=models.Subquery(average_health),
+            annotated_open_alerts=Coalesce(models.Subquery(open_alerts), 0)
+        )
 
 class Farm(models.Model):
-    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    id = models.UUIDField(primary_key=True, default=uuid7, editable=False)
     owner = models.ForeignKey(User, on_delete=models.CASCADE, related_name='farms')
     name = models.CharField(max_length=200)
     description = models.TextField(blank=True)
@@ -14,6 +57,8 @@ class Farm(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
     
+    objects = FarmQuerySet.as_manager()
+    
     class Meta:
         db_table = 'farms'
         indexes = [
@@ -26,16 +71,151 @@ class Farm(models.Model):
     
     @property
     def fields_count(self):
+        if hasattr(self, 'annotated_fields_count'):
+            return self.annotated_fields_count
         return self.fields.count()
     
+    @property
+    def open_alerts_count(self):
+        if hasattr(self, 'annotated_open_alerts'):
+            return self.annotated_open_alerts
+        return self.alerts.unresolved().count()
+    
     @property
     def average_health_score(self):
-        from django.db.models import Avg
-        avg_health = self.fields.aggregate(
-            avg_health=Avg('health_data__health_score')
-        )['avg_health']
+        if hasattr(self, 'annotated_average_health'):
+            avg_health = self.annotated_average_health
+        else:
+            avg_health = self.fields.aggregate(
+                avg_health=models.Avg('health_data__health_score')
+            )['avg_health']
         return round(avg_health, 2) if avg_health else 0
 
+def parse_polygon_ring(polygon_coordinates):
+    """
+    Outer ring of a GeoJSON polygon (a Polygon geometry or its coordinates
+    array, as a JSON string or already decoded) as an (n, 2) float array of
+    (longitude, latitude) points, or None if it cannot be parsed.
+    """
+    try:
+        polygon = json.loads(polygon_coordinates) if isinstance(polygon_coordinates, str) else polygon_coordinates
+        if isinstance(polygon, dict):
+            polygon = polygon['coordinates']
+        ring = np.asarray(polygon[0], dtype=np.float64)
+    except (TypeError, ValueError, KeyError, IndexError):
+        return None
+    
+    if ring.ndim != 2 or ring.shape[1] < 2 or not len(ring):
+        return None
+    return ring[:, :2]
+
+def _polygon_centroid(polygon_coordinates):
+    """
+    Centroid of a GeoJSON polygon (a Polygon geometry or its coordinates
+    array) as (latitude, longitude), or None if it cannot be parsed.
+    """
+    ring = parse_polygon_ring(polygon_coordinates)
+    if ring is None:
+        return None
+    
+    # Area-weighted centroid of the outer ring (shoelace formula), over
+    # whole coordinate arrays rather than point by point
+    x0, y0 = ring[:, 0], ring[:, 1]
+    x1, y1 = np.roll(x0, -1), np.roll(y0, -1)
+    cross = x0 * y1 - x1 * y0
+    area = cross.sum()
+    
+    if area == 0:
+        # Degenerate ring, fall back to the mean of its points
+        return float(y0.mean()), float(x0.mean())
+    
+    return float(((y0 + y1) * cross).sum() / (3 * area)), float(((x0 + x1) * cross).sum() / (3 * area))
+
+class FieldQuerySet(models.QuerySet):
+    def with_recent_health(self, n=7):
+        """
+        Prefetch the latest `n` health readings of each field into
+        `_recent_health`, which current_health and health_trend read from.
+        """
+        if any(getattr(lookup, 'to_attr', None) == '_recent_health' for lookup in self._prefetch_related_lookups):
+            return self
+        return self.prefetch_related(models.Prefetch(
+            'health_data',
+            queryset=CropHealth.objects.only(*CropHealth.READING_FIELDS).order_by('-measured_at')[:n],
+            to_attr='_recent_health'
+        ))
+    
+    def with_latest_readings(self, weather_days=1):
+        """
+        Everything the field list renders besides the field columns: the
+        recent health readings, the latest `weather_days` weather rows
+        (`_recent_weather`), the latest soil moisture row
+        (`_latest_soil_moisture`) and the open alert count.
+        """
+        return self.with_recent_health().annotate(
+            annotated_active_alerts=models.Count('alerts', filter=models.Q(alerts__is_resolved=False))
+        ).prefetch_related(
+            models.Prefetch(
+                'weather_data',
+                queryset=WeatherData.objects.only(*WeatherData.READING_FIELDS).with_temperature_avg().order_by('-weather_date')[:weather_days],
+                to_attr='_recent_weather'
+            ),
+            models.Prefetch(
+                'soil_moisture_data',
+                queryset=SoilMoisture.objects.only(*SoilMoisture.READING_FIELDS).order_by('-measured_at')[:1],
+                to_attr='_latest_soil_moisture'
+            )
+        )
+    
+    def full_detail(self):
+        """
+        Load everything the field detail page renders: the farm and its
+        owner in the same query, the list readings with a week of weather,
+        and the open alerts and satellite images as `_recent_*` lists.
+        """
+        return self.select_related('farm__owner').with_latest_readings(weather_days=7).prefetch_related(
+            models.Prefetch(
+                'alerts',
+                queryset=Alert.active.order_by('-created_at')[:5],
+                to_attr='_recent_open_alerts'
+            ),
+            models.Prefetch(
+                'satellite_images',
+                queryset=SatelliteImage.objects.order_by('-captured_at')[:5],
+                to_attr='_recent_images'
+            )
+        )
+    
+    def within_bbox(self, west, south, east, north):
+        """
+        Fields whose centroid lies inside the bounding box, answered from
+        the indexed centroid columns instead of parsing every polygon.
+        """
+        return self.filter(
+            centroid_latitude__range=(south, north),
+            centroid_longitude__range=(west, east)
+        )
+    
+    def with_planting_dates(self):
+        """
+        Annotate days since planting and days to harvest computed by the
+        database against a single now(). Backends without a native interval
+        type cannot extract days from a date difference, so there the
+        properties keep computing them in Python.
+        """
+        if not connections[self.db].features.has_native_duration_field:
+            return self
+        
+        today = Cast(Now(), output_field=models.DateField())
+        return self.annotate(
+            _days_since_planting=ExtractDay(models.ExpressionWrapper(
+                today - models.F('planting_date'), output_field=models.DurationField()
+            )),
+            _days_to_harvest=ExtractDay(models.ExpressionWrapper(
+                models.F('expected_harvest') - today, output_field=models.DurationField()
+            ))
+        )
+
 class Field(models.Model):
     CROP_CHOICES = [
         ('wheat', 'Wheat'),
@@ -57,7 +237,10 @@ class Field(models.Model):
         ('harvest', 'Harvest'),
     ]
     
-    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    CROP_DISPLAY = dict(CROP_CHOICES)
+    GROWTH_DISPLAY = dict(GROWTH_STAGES)
+    
+    id = models.UUIDField(primary_key=True, default=uuid7, editable=False)
     farm = models.ForeignKey(Farm, on_delete=models.CASCADE, related_name='fields')
     name = models.CharField(max_length=200)
     crop_type = models.CharField(max_length=50, choices=CROP_CHOICES)
@@ -67,29 +250,77 @@ class Field(models.Model):
     expected_harvest = models.DateField(null=True, blank=True)
     growth_stage = models.CharField(max_length=50, choices=GROWTH_STAGES, default='germination')
     is_active = models.BooleanField(default=True)
+    # Derived from polygon_coordinates on save so location based lookups
+    # (fire checks, weather) do not recompute it on every run
+    centroid_latitude = models.FloatField(null=True, blank=True, editable=False)
+    centroid_longitude = models.FloatField(null=True, blank=True, editable=False)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
     
+    objects = FieldQuerySet.as_manager()
+    
     class Meta:
         db_table = 'fields'
         indexes = [
             models.Index(fields=['farm', 'crop_type']),
             models.Index(fields=['planting_date']),
             models.Index(fields=['is_active']),
+            models.Index(fields=['crop_type', 'is_active']),
+            models.Index(fields=['centroid_latitude', 'centroid_longitude'], name='field_centroid_idx'),
         ]
         ordering = ['-created_at']
     
     def __str__(self):
-        return f"{self.name} - {self.get_crop_type_display()}"
+        return f"{self.name} - {self.CROP_DISPLAY.get(self.crop_type, self.crop_type)}"
+    
+    def save(self, *args, **kwargs):
+        centroid = _polygon_centroid(self.polygon_coordinates)
+        self.centroid_latitude, self.centroid_longitude = centroid or (None, None)
+        
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None and 'polygon_coordinates' in update_fields:
+            kwargs['update_fields'] = set(update_fields) | {'centroid_latitude', 'centroid_longitude'}
+        
+        super().save(*args, **kwargs)
+    
+    @property
+    def centroid(self):
+        """(latitude, longitude) of the field centroid, or None"""
+        if self.centroid_latitude is None or self.centroid_longitude is None:
+            return None
+        return self.centroid_latitude, self.centroid_longitude
     
     @property
     def current_health(self):
+        if hasattr(self, '_recent_health'):
+            return self._recent_health[0] if self._recent_health else None
         return self.health_data.order_by('-measured_at').first()
     
+    @property
+    def latest_weather(self):
+        if hasattr(self, '_recent_weather'):
+            return self._recent_weather[0] if self._recent_weather else None
+        return self.weather_data.order_by('-weather_date').first()
+    
+    @property
+    def latest_soil_moisture(self):
+        if hasattr(self, '_latest_soil_moisture'):
+            return self._latest_soil_moisture[0] if self._latest_soil_moisture else None
+        return self.soil_moisture_data.order_by('-measured_at').first()
+    
+    @property
+    def active_alerts_count(self):
+        if hasattr(self, 'annotated_active_alerts'):
+            return self.annotated_active_alerts
+        return self.alerts.unresolved().count()
+    
     @property
     def health_trend(self):
         """Calculate 7-day health trend"""
-        recent_data = self.health_data.order_by('-measured_at')[:7]
+        if hasattr(self, '_recent_health'):
+            recent_data = self._recent_health[:7]
+        else:
+            recent_data = list(self.health_data.order_by('-measured_at')[:7])
         if len(recent_data) >= 2:
             current = recent_data[0].health_score
             previous = recent_data[-1].health_score
@@ -98,16 +329,59 @@ class Field(models.Model):
     
     @property
     def days_since_planting(self):
+        if hasattr(self, '_days_since_planting'):
+            return self._days_since_planting
         if self.planting_date:
             return (timezone.now().date() - self.planting_date).days
         return None
     
     @property
     def days_to_harvest(self):
+        if hasattr(self, '_days_to_harvest'):
+            return self._days_to_harvest
         if self.expected_harvest:
             return (self.expected_harvest - timezone.now().date()).days
         return None
 
+class CropHealthQuerySet(models.QuerySet):
+    def bulk_ingest(self, rows, batch_size=1000):
+        """
+        Insert many health readings at once, filling in status and health
+        score from NDVI in one vectorized pass instead of a save() per row.
+        
+        No health alerts are raised here: with ignore_conflicts the result
+        also holds rows that already existed, so callers pass the readings
+        they know are new to alert_rules.evaluate_alerts_for_batch().
+        
+        Args:
+            rows: List of dicts of CropHealth field values
+            batch_size: Rows per INSERT statement
+            
+        Returns:
+            List of the created CropHealth instances
+        """
+        if not rows:
+            return []
+        
+        ndvi = np.array([row['ndvi_value'] for row in rows], dtype=np.float64)
+        statuses = np.select(
+            [ndvi >= 0.7, ndvi >= 0.5, ndvi >= 0.3, ndvi >= 0.1],
+            ['excellent', 'good', 'fair', 'poor'],
+            default='critical'
+        )
+        scores = np.round(np.clip((ndvi + 1) * 50, 0, 100), 2)
+        
+        instances = []
+        for row, status, score in zip(rows, statuses.tolist(), scores.tolist()):
+            values = dict(row)
+            if not values.get('status'):
+                values['status'] = status
+            if not values.get('health_score'):
+                values['health_score'] = score
+            instances.append(self.model(**values))
+        
+        return self.bulk_create(instances, batch_size=batch_size, ignore_conflicts=True)
+
 class CropHealth(models.Model):
     HEALTH_STATUS = [
         ('excellent', 'Excellent'),
@@ -124,7 +398,15 @@ class CropHealth(models.Model):
         ('manual', 'Manual Entry'),
     ]
     
-    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    HEALTH_DISPLAY = dict(HEALTH_STATUS)
+    
+    # Columns rendered by CropHealthSerializer; reading prefetches load only these
+    READING_FIELDS = (
+        'id', 'ndvi_value', 'evi_value', 'health_score', 'status', 'analysis_notes',
+        'measured_at', 'data_source', 'confidence_level', 'created_at', 'field'
+    )
+    
+    id = models.UUIDField(primary_key=True, default=uuid7, editable=False)
     field = models.ForeignKey(Field, on_delete=models.CASCADE, related_name='health_data')
     ndvi_value = models.FloatField(
         validators=[MinValueValidator(-1), MaxValueValidator(1)],
@@ -150,14 +432,24 @@ class CropHealth(models.Model):
     )
     created_at = models.DateTimeField(auto_now_add=True)
     
+    objects = CropHealthQuerySet.as_manager()
+    
     class Meta:
         db_table = 'crop_health'
         indexes = [
-            models.Index(fields=['field', 'measured_at']),
+            models.Index(fields=['field', '-measured_at'], name='crophealth_field_measured_desc'),
             models.Index(fields=['status', 'measured_at']),
             models.Index(fields=['data_source']),
+            models.Index(fields=['ndvi_value']),
+            models.Index(fields=['health_score']),
+        ]
+        constraints = [
+            # Column order lets the constraint's index serve the per-source
+            # latest-readings lookup (field, data_source, newest first)
+            models.UniqueConstraint(
+                fields=['field', 'data_source', 'measured_at'], name='ch_unique_f_ds_m'
+            ),
         ]
-        unique_together = ['field', 'measured_at', 'data_source']
         ordering = ['-measured_at']
     
     def __str__(self):
@@ -185,6 +477,13 @@ class CropHealth(models.Model):
         
         super().save(*args, **kwargs)
 
+class WeatherDataQuerySet(models.QuerySet):
+    def with_temperature_avg(self):
+        """Annotate the daily mean temperature so it is not computed per row"""
+        return self.annotate(temperature_avg=Round(
+            (models.F('temperature_min') + models.F('temperature_max')) / 2.0, 1
+        ))
+
 class WeatherData(models.Model):
     DATA_SOURCES = [
         ('nasa_power', 'NASA POWER'),
@@ -192,7 +491,13 @@ class WeatherData(models.Model):
         ('manual', 'Manual Entry'),
     ]
     
-    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    # Columns rendered by WeatherDataSerializer; reading prefetches load only these
+    READING_FIELDS = (
+        'id', 'temperature_min', 'temperature_max', 'precipitation', 'humidity', 'wind_speed',
+        'solar_radiation', 'weather_date', 'data_source', 'created_at', 'field'
+    )
+    
+    id = models.UUIDField(primary_key=True, default=uuid7, editable=False)
     field = models.ForeignKey(Field, on_delete=models.CASCADE, related_name='weather_data')
     temperature_min = models.FloatField(help_text="Minimum temperature in Celsius")
     temperature_max = models.FloatField(help_text="Maximum temperature in Celsius")
@@ -204,17 +509,37 @@ class WeatherData(models.Model):
     data_source = models.CharField(max_length=20, choices=DATA_SOURCES)
     created_at = models.DateTimeField(auto_now_add=True)
     
+    objects = WeatherDataQuerySet.as_manager()
+    
     class Meta:
         db_table = 'weather_data'
         indexes = [
-            models.Index(fields=['field', 'weather_date']),
+            models.Index(fields=['field', '-weather_date'], name='weather_field_date_desc'),
             models.Index(fields=['weather_date']),
+            models.Index(fields=['temperature_min']),
+            models.Index(fields=['temperature_max']),
+            models.Index(fields=['precipitation']),
+        ]
+        constraints = [
+            models.UniqueConstraint(
+                fields=['field', 'data_source', 'weather_date'], name='weather_unique_f_ds_d'
+            ),
         ]
-        unique_together = ['field', 'weather_date', 'data_source']
         ordering = ['-weather_date']
     
     def __str__(self):
         return f"{self.field.name} - {self.weather_date}"
+    
+    @property
+    def temperature_avg(self):
+        if getattr(self, '_temperature_avg', None) is None:
+            return round((self.temperature_min + self.temperature_max) / 2, 1)
+        return self._temperature_avg
+    
+    @temperature_avg.setter
+    def temperature_avg(self, value):
+        # Set by the with_temperature_avg() annotation
+        self._temperature_avg = value
 
 class SoilMoisture(models.Model):
     SATELLITE_SOURCES = [
@@ -224,7 +549,13 @@ class SoilMoisture(models.Model):
         ('manual', 'Manual Measurement'),
     ]
     
-    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    # Columns rendered by SoilMoistureSerializer; reading prefetches load only these
+    READING_FIELDS = (
+        'id', 'moisture_percentage', 'depth_cm', 'measured_at', 'satellite_source',
+        'quality_flag', 'created_at', 'field'
+    )
+    
+    id = models.UUIDField(primary_key=True, default=uuid7, editable=False)
     field = models.ForeignKey(Field, on_delete=models.CASCADE, related_name='soil_moisture_data')
     moisture_percentage = models.FloatField(
         validators=[MinValueValidator(0), MaxValueValidator(100)],
@@ -247,7 +578,7 @@ class SoilMoisture(models.Model):
     class Meta:
         db_table = 'soil_moisture'
         indexes = [
-            models.Index(fields=['field', 'measured_at']),
+            models.Index(fields=['field', '-measured_at'], name='soil_field_measured_desc'),
             models.Index(fields=['measured_at']),
         ]
         ordering = ['-measured_at']
@@ -270,7 +601,7 @@ class SatelliteImage(models.Model):
         ('failed', 'Failed'),
     ]
     
-    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    id = models.UUIDField(primary_key=True, default=uuid7, editable=False)
     field = models.ForeignKey(Field, on_delete=models.CASCADE, related_name='satellite_images')
     image_url = models.URLField()
     thumbnail_url = models.URLField(blank=True)
@@ -292,15 +623,45 @@ class SatelliteImage(models.Model):
     class Meta:
         db_table = 'satellite_images'
         indexes = [
-            models.Index(fields=['field', 'captured_at']),
+            models.Index(fields=['field', '-captured_at'], name='satimage_field_captured_desc'),
             models.Index(fields=['satellite_source', 'captured_at']),
             models.Index(fields=['processing_status']),
+            # Serves containment lookups (metadata__contains={...}) on PostgreSQL
+            GinIndex(fields=['metadata'], name='satimg_meta_gin', opclasses=['jsonb_path_ops']),
         ]
         ordering = ['-captured_at']
     
     def __str__(self):
         return f"{self.field.name} - {self.satellite_source} ({self.captured_at.date()})"
 
+class AlertQuerySet(models.QuerySet):
+    def unresolved(self):
+        """Open alerts; served by the alert_unresolved_idx partial index"""
+        return self.filter(is_resolved=False)
+    
+    def severity_counts(self):
+        """
+        Number of alerts per severity level, most severe first, from a
+        single GROUP BY query instead of one COUNT per level.
+        """
+        counts = dict(self.order_by().values_list('severity').annotate(count=models.Count('pk')))
+        return {
+            level: counts.get(level, 0) for level, _ in reversed(self.model.SEVERITY_LEVELS)
+        }
+    
+    def resolve(self, user=None):
+        """Mark every alert in the queryset as resolved with a single UPDATE"""
+        updates = {'is_resolved': True, 'resolved_at': timezone.now()}
+        if user:
+            updates['resolved_by'] = user
+        return self.update(**updates)
+
+class ActiveAlertManager(models.Manager.from_queryset(AlertQuerySet)):
+    """Manager over the unresolved alerts only (`Alert.active`)"""
+    
+    def get_queryset(self):
+        return super().get_queryset().unresolved()
+
 class Alert(models.Model):
     ALERT_TYPES = [
         ('health', 'Crop Health'),
@@ -318,8 +679,14 @@ class Alert(models.Model):
         ('critical', 'Critical'),
     ]
     
-    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    ALERT_TYPE_DISPLAY = dict(ALERT_TYPES)
+    SEVERITY_DISPLAY = dict(SEVERITY_LEVELS)
+    
+    id = models.UUIDField(primary_key=True, default=uuid7, editable=False)
     field = models.ForeignKey(Field, on_delete=models.CASCADE, related_name='alerts')
+    # Copied from field.farm on save so farm level alert queries skip the
+    # join through fields
+    farm = models.ForeignKey(Farm, on_delete=models.CASCADE, related_name='alerts', editable=False)
     alert_type = models.CharField(max_length=20, choices=ALERT_TYPES)
     severity = models.CharField(max_length=10, choices=SEVERITY_LEVELS)
     title = models.CharField(max_length=200)
@@ -332,22 +699,58 @@ class Alert(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     resolved_at = models.DateTimeField(null=True, blank=True)
     
+    objects = AlertQuerySet.as_manager()
+    active = ActiveAlertManager()
+    
     class Meta:
         db_table = 'alerts'
         indexes = [
-            models.Index(fields=['field', 'created_at']),
+            models.Index(fields=['field', '-created_at'], name='alert_field_created_desc'),
+            models.Index(fields=['farm', 'is_resolved', '-created_at'], name='alert_farm_resolved_created'),
             models.Index(fields=['alert_type', 'severity']),
+            models.Index(fields=['severity']),
             models.Index(fields=['is_resolved', 'created_at']),
+            # Open alerts only; serves the has_alerts EXISTS check through
+            # its leading column and the newest-open-alerts lists in full
+            models.Index(
+                fields=['field', '-created_at'], condition=models.Q(is_resolved=False),
+                name='alert_unresolved_idx'
+            ),
+            models.Index(
+                fields=['alert_type', 'resolved_at', 'created_at'],
+                name='alert_type_resolved_created_ix'
+            ),
+            models.Index(
+                fields=['field', 'alert_type', 'resolved_at', 'created_at'],
+                name='alert_field_dedup_ix'
+            ),
         ]
         ordering = ['-created_at']
     
     def __str__(self):
         return f"{self.title} - {self.field.name} ({self.severity})"
     
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Remember the stored resolved state so pre_save can tell whether it
+        # changed without reading the row again
+        if 'is_resolved' in field_names:
+            instance._loaded_is_resolved = values[field_names.index('is_resolved')]
+        return instance
+    
+    def save(self, *args, **kwargs):
+        if self.farm_id is None and self.field_id is not None:
+            self.farm_id = self.field.farm_id
+        super().save(*args, **kwargs)
+        self._loaded_is_resolved = self.is_resolved
+    
     def resolve(self, user=None):
         """Mark alert as resolved"""
         self.is_resolved = True
         self.resolved_at = timezone.now()
         if user:
             self.resolved_by = user
-        self.save()
\ No newline at end of file
+        type(self).objects.filter(pk=self.pk).update(
+            is_resolved=True, resolved_at=self.resolved_at, resolved_by=self.resolved_by
+        )
\ No newline at end of file
@@ -0,0 +1,12 @@
+from rest_framework.pagination import CursorPagination
+
+class TimeCursorPagination(CursorPagination):
+    """
+    Cursor pagination for the ever-growing reading and alert tables. Each
+    page is a range scan from the cursor position on the view's ordering
+    (taken from its OrderingFilter), with no COUNT(*) over the table and no
+    deep OFFSET. Views using it should only allow ordering by their time
+    column: on a low-cardinality column the cursor degrades to an offset
+    within equal values.
+    """
+    ordering = '-created_at'
\ No newline at end of file
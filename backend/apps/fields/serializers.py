@@ -1,72 +1,159 @@
+import copy
+from functools import lru_cache
+
+import numpy as np
+
 from rest_framework import serializers
+from rest_framework.fields import SkipField
+from rest_framework.relations import PKOnlyObject
+from rest_framework.validators import UniqueTogetherValidator
 # from rest_framework_gis.serializers import GeoFeatureModelSerializer  # Temporarily disabled
 from django.contrib.auth.models import User
-from .models import Farm, Field, CropHealth, WeatherData, SoilMoisture, SatelliteImage, Alert
+from django.utils import timezone
+from .models import (
+    Farm, Field, CropHealth, WeatherData, SoilMoisture, SatelliteImage, Alert, parse_polygon_ring
+)
+
+# Validation bounds and messages, built once at import rather than per call
+VEGETATION_INDEX_MIN, VEGETATION_INDEX_MAX = -1, 1
+MAX_FIELD_AREA_HECTARES = 10000
+
+NDVI_RANGE_ERROR = "NDVI value must be between -1 and 1"
+EVI_RANGE_ERROR = "EVI value must be between -1 and 1"
+TEMPERATURE_ORDER_ERROR = "Minimum temperature cannot be greater than maximum temperature"
+AREA_POSITIVE_ERROR = "Area must be greater than 0"
+AREA_LIMIT_ERROR = "Area cannot exceed 10,000 hectares"
+HARVEST_ORDER_ERROR = "Expected harvest date must be after planting date"
+FUTURE_MEASUREMENT_ERROR = "Measurement date cannot be in the future"
+POLYGON_FORMAT_ERROR = "Polygon must be GeoJSON polygon coordinates"
+POLYGON_RING_ERROR = "Polygon ring must be closed and have at least 4 points"
+POLYGON_BOUNDS_ERROR = "Polygon coordinates must be valid longitude/latitude pairs"
+POLYGON_AREA_ERROR = "Polygon must enclose a non-zero area"
 
-class UserSerializer(serializers.ModelSerializer):
+@lru_cache(maxsize=None)
+def _choice_labels(model, field_name):
+    return dict(model._meta.get_field(field_name).flatchoices)
+
+class DisplayField(serializers.ReadOnlyField):
+    """
+    Human readable label of a choices model field. Reads the raw value and
+    maps it through the field's choices once per model field, instead of
+    calling get_<field>_display() for every row.
+    """
+    
+    def __init__(self, field_name, **kwargs):
+        kwargs['source'] = field_name
+        super().__init__(**kwargs)
+    
+    def to_representation(self, value):
+        labels = _choice_labels(self.parent.Meta.model, self.source)
+        return str(labels.get(value, value))
+
+class CachedFieldsModelSerializer(serializers.ModelSerializer):
+    """
+    ModelSerializer that builds its fields from the model once per class
+    and hands each instance shallow copies of them, instead of repeating
+    the model introspection for every serializer (and every nested one).
+    """
+    _fields_cache = {}
+    
+    def get_fields(self):
+        cached = self._fields_cache.get(type(self))
+        if cached is None:
+            cached = self._fields_cache[type(self)] = super().get_fields()
+        return {name: copy.copy(field) for name, field in cached.items()}
+    
+    def to_representation(self, instance):
+        """
+        Same as Serializer.to_representation(), but builds a plain dict
+        (ordered since Python 3.7) instead of an OrderedDict, and resolves
+        the readable fields once per serializer rather than once per row.
+        """
+        readable_fields = self.__dict__.get('_readable_field_list')
+        if readable_fields is None:
+            readable_fields = self._readable_field_list = list(self._readable_fields)
+        
+        ret = {}
+        for field in readable_fields:
+            try:
+                attribute = field.get_attribute(instance)
+            except SkipField:
+                continue
+            
+            check_for_none = attribute.pk if isinstance(attribute, PKOnlyObject) else attribute
+            if check_for_none is None:
+                ret[field.field_name] = None
+            else:
+                ret[field.field_name] = field.to_representation(attribute)
+        
+        return ret
+
+class UserSerializer(CachedFieldsModelSerializer):
     class Meta:
         model = User
         fields = ('id', 'username', 'email', 'first_name', 'last_name')
         read_only_fields = ('id',)
 
-class CropHealthSerializer(serializers.ModelSerializer):
-    status_display = serializers.CharField(source='get_status_display', read_only=True)
-    data_source_display = serializers.CharField(source='get_data_source_display', read_only=True)
+class CropHealthSerializer(CachedFieldsModelSerializer):
+    status_display = DisplayField(field_name='status')
+    data_source_display = DisplayField(field_name='data_source')
     
     class Meta:
         model = CropHealth
-        fields = '__all__'
+        fields = ('id', 'status_display', 'data_source_display') + CropHealth.READING_FIELDS[1:]
         read_only_fields = ('id', 'created_at')
+        # DRF does not derive validators from UniqueConstraint
+        validators = [
+            UniqueTogetherValidator(CropHealth.objects.all(), ('field', 'data_source', 'measured_at'))
+        ]
     
     def validate_ndvi_value(self, value):
-        if not -1 <= value <= 1:
-            raise serializers.ValidationError("NDVI value must be between -1 and 1")
+        if not VEGETATION_INDEX_MIN <= value <= VEGETATION_INDEX_MAX:
+            raise serializers.ValidationError(NDVI_RANGE_ERROR)
         return value
     
     def validate_evi_value(self, value):
-        if value is not None and not -1 <= value <= 1:
-            raise serializers.ValidationError("EVI value must be between -1 and 1")
+        if value is not None and not VEGETATION_INDEX_MIN <= value <= VEGETATION_INDEX_MAX:
+            raise serializers.ValidationError(EVI_RANGE_ERROR)
         return value
 
-class WeatherDataSerializer(serializers.ModelSerializer):
-    data_source_display = serializers.CharField(source='get_data_source_display', read_only=True)
-    temperature_avg = serializers.SerializerMethodField()
+class WeatherDataSerializer(CachedFieldsModelSerializer):
+    data_source_display = DisplayField(field_name='data_source')
+    temperature_avg = serializers.FloatField(read_only=True)
     
     class Meta:
         model = WeatherData
-        fields = '__all__'
+        fields = ('id', 'data_source_display', 'temperature_avg') + WeatherData.READING_FIELDS[1:]
         read_only_fields = ('id', 'created_at')
-    
-    def get_temperature_avg(self, obj):
-        return round((obj.temperature_min + obj.temperature_max) / 2, 1)
+        validators = [
+            UniqueTogetherValidator(WeatherData.objects.all(), ('field', 'data_source', 'weather_date'))
+        ]
     
     def validate(self, data):
         if data['temperature_min'] > data['temperature_max']:
-            raise serializers.ValidationError(
-                "Minimum temperature cannot be greater than maximum temperature"
-            )
+            raise serializers.ValidationError(TEMPERATURE_ORDER_ERROR)
         return data
 
-class SoilMoistureSerializer(serializers.ModelSerializer):
-    satellite_source_display = serializers.CharField(source='get_satellite_source_display', read_only=True)
+class SoilMoistureSerializer(CachedFieldsModelSerializer):
+    satellite_source_display = DisplayField(field_name='satellite_source')
     
     class Meta:
         model = SoilMoisture
-        fields = '__all__'
+        fields = ('id', 'satellite_source_display') + SoilMoisture.READING_FIELDS[1:]
         read_only_fields = ('id', 'created_at')
 
-class SatelliteImageSerializer(serializers.ModelSerializer):
-    satellite_source_display = serializers.CharField(source='get_satellite_source_display', read_only=True)
-    processing_status_display = serializers.CharField(source='get_processing_status_display', read_only=True)
+class SatelliteImageSerializer(CachedFieldsModelSerializer):
+    satellite_source_display = DisplayField(field_name='satellite_source')
+    processing_status_display = DisplayField(field_name='processing_status')
     
     class Meta:
         model = SatelliteImage
         fields = '__all__'
         read_only_fields = ('id', 'created_at')
 
-class AlertSerializer(serializers.ModelSerializer):
-    alert_type_display = serializers.CharField(source='get_alert_type_display', read_only=True)
-    severity_display = serializers.CharField(source='get_severity_display', read_only=True)
+class AlertSerializer(CachedFieldsModelSerializer):
+    alert_type_display = DisplayField(field_name='alert_type')
+    severity_display = DisplayField(field_name='severity')
     resolved_by_name = serializers.CharField(source='resolved_by.username', read_only=True)
     days_since_created = serializers.SerializerMethodField()
     
@@ -76,17 +163,89 @@ class AlertSerializer(serializers.ModelSerializer):
         read_only_fields = ('id', 'created_at', 'resolved_at', 'resolved_by')
     
     def get_days_since_created(self, obj):
-        from django.utils import timezone
-        return (timezone.now() - obj.created_at).days
-
-class FieldSerializer(serializers.ModelSerializer):
-    current_health = serializers.SerializerMethodField()
-    health_trend = serializers.SerializerMethodField()
-    latest_weather = serializers.SerializerMethodField()
-    latest_soil_moisture = serializers.SerializerMethodField()
-    active_alerts_count = serializers.SerializerMethodField()
-    crop_type_display = serializers.CharField(source='get_crop_type_display', read_only=True)
-    growth_stage_display = serializers.CharField(source='get_growth_stage_display', read_only=True)
+        # One now() per response, shared through the (root) serializer context
+        now = self.context.get('_now')
+        if now is None:
+            now = self.context['_now'] = timezone.now()
+        return (now - obj.created_at).days
+
+# The latest reading of each kind is rendered once per field row, so it is
+# built as a dict by hand rather than through a nested serializer. Keys and
+# value formats match CropHealthSerializer, WeatherDataSerializer and
+# SoilMoistureSerializer.
+_format_datetime = serializers.DateTimeField().to_representation
+_format_date = serializers.DateField().to_representation
+
+def _label(model, field_name, value):
+    return str(_choice_labels(model, field_name).get(value, value))
+
+def _crop_health_to_dict(obj):
+    return {
+        'id': str(obj.id),
+        'status_display': _label(CropHealth, 'status', obj.status),
+        'data_source_display': _label(CropHealth, 'data_source', obj.data_source),
+        'ndvi_value': obj.ndvi_value,
+        'evi_value': obj.evi_value,
+        'health_score': obj.health_score,
+        'status': obj.status,
+        'analysis_notes': obj.analysis_notes,
+        'measured_at': _format_datetime(obj.measured_at),
+        'data_source': obj.data_source,
+        'confidence_level': obj.confidence_level,
+        'created_at': _format_datetime(obj.created_at),
+        'field': obj.field_id,
+    }
+
+def _weather_to_dict(obj):
+    return {
+        'id': str(obj.id),
+        'data_source_display': _label(WeatherData, 'data_source', obj.data_source),
+        'temperature_avg': obj.temperature_avg,
+        'temperature_min': obj.temperature_min,
+        'temperature_max': obj.temperature_max,
+        'precipitation': obj.precipitation,
+        'humidity': obj.humidity,
+        'wind_speed': obj.wind_speed,
+        'solar_radiation': obj.solar_radiation,
+        'weather_date': _format_date(obj.weather_date),
+        'data_source': obj.data_source,
+        'created_at': _format_datetime(obj.created_at),
+        'field': obj.field_id,
+    }
+
+def _soil_moisture_to_dict(obj):
+    return {
+        'id': str(obj.id),
+        'satellite_source_display': _label(SoilMoisture, 'satellite_source', obj.satellite_source),
+        'moisture_percentage': obj.moisture_percentage,
+        'depth_cm': obj.depth_cm,
+        'measured_at': _format_datetime(obj.measured_at),
+        'satellite_source': obj.satellite_source,
+        'quality_flag': obj.quality_flag,
+        'created_at': _format_datetime(obj.created_at),
+        'field': obj.field_id,
+    }
+
+class ReadingDictField(serializers.ReadOnlyField):
+    """Read-only field that renders a model instance with a dict builder."""
+    
+    def __init__(self, to_dict, **kwargs):
+        self.to_dict = to_dict
+        super().__init__(**kwargs)
+    
+    def to_representation(self, value):
+        return self.to_dict(value)
+
+class FieldSerializer(CachedFieldsModelSerializer):
+    # Plain fields over Field properties, which read the values prefetched
+    # and annotated by Field.objects.with_latest_readings() when present
+    current_health = ReadingDictField(_crop_health_to_dict)
+    health_trend = serializers.ReadOnlyField()
+    latest_weather = ReadingDictField(_weather_to_dict)
+    latest_soil_moisture = ReadingDictField(_soil_moisture_to_dict)
+    active_alerts_count = serializers.IntegerField(read_only=True)
+    crop_type_display = DisplayField(field_name='crop_type')
+    growth_stage_display = DisplayField(field_name='growth_stage')
     days_since_planting = serializers.ReadOnlyField()
     days_to_harvest = serializers.ReadOnlyField()
     
@@ -100,30 +259,6 @@ class FieldSerializer(serializers.ModelSerializer):
             'days_to_harvest', 'created_at', 'updated_at'
         )
         read_only_fields = ('id', 'created_at', 'updated_at')
-    
-    def get_current_health(self, obj):
-        latest_health = obj.health_data.order_by('-measured_at').first()
-        if latest_health:
-            return CropHealthSerializer(latest_health).data
-        return None
-    
-    def get_health_trend(self, obj):
-        return obj.health_trend
-    
-    def get_latest_weather(self, obj):
-        latest_weather = obj.weather_data.order_by('-weather_date').first()
-        if latest_weather:
-            return WeatherDataSerializer(latest_weather).data
-        return None
-    
-    def get_latest_soil_moisture(self, obj):
-        latest_moisture = obj.soil_moisture_data.order_by('-measured_at').first()
-        if latest_moisture:
-            return SoilMoistureSerializer(latest_moisture).data
-        return None
-    
-    def get_active_alerts_count(self, obj):
-        return obj.alerts.filter(is_resolved=False).count()
 
 class FieldDetailSerializer(FieldSerializer):
     recent_health_data = serializers.SerializerMethodField()
@@ -136,26 +271,42 @@ class FieldDetailSerializer(FieldSerializer):
             'recent_health_data', 'recent_weather_data', 'recent_alerts', 'satellite_images'
         )
     
+    # The `_recent_*` lists are prefetched by Field.objects.full_detail(); the
+    # health and weather ones are the same lists FieldSerializer reads
+    
     def get_recent_health_data(self, obj):
-        recent_data = obj.health_data.order_by('-measured_at')[:7]
+        if hasattr(obj, '_recent_health'):
+            recent_data = obj._recent_health[:7]
+        else:
+            recent_data = obj.health_data.order_by('-measured_at')[:7]
         return CropHealthSerializer(recent_data, many=True).data
     
     def get_recent_weather_data(self, obj):
-        recent_data = obj.weather_data.order_by('-weather_date')[:7]
+        if hasattr(obj, '_recent_weather'):
+            recent_data = obj._recent_weather[:7]
+        else:
+            recent_data = obj.weather_data.order_by('-weather_date')[:7]
         return WeatherDataSerializer(recent_data, many=True).data
     
     def get_recent_alerts(self, obj):
-        recent_alerts = obj.alerts.filter(is_resolved=False).order_by('-created_at')[:5]
+        if hasattr(obj, '_recent_open_alerts'):
+            recent_alerts = obj._recent_open_alerts[:5]
+        else:
+            recent_alerts = obj.alerts.unresolved().order_by('-created_at')[:5]
         return AlertSerializer(recent_alerts, many=True).data
     
     def get_satellite_images(self, obj):
-        recent_images = obj.satellite_images.order_by('-captured_at')[:5]
+        if hasattr(obj, '_recent_images'):
+            recent_images = obj._recent_images[:5]
+        else:
+            recent_images = obj.satellite_images.order_by('-captured_at')[:5]
         return SatelliteImageSerializer(recent_images, many=True).data
 
-class FarmSerializer(serializers.ModelSerializer):
-    fields_count = serializers.SerializerMethodField()
-    average_health = serializers.SerializerMethodField()
-    total_alerts = serializers.SerializerMethodField()
+class FarmSerializer(CachedFieldsModelSerializer):
+    # Farm properties over the FarmQuerySet.with_stats() annotations
+    fields_count = serializers.ReadOnlyField()
+    average_health = serializers.ReadOnlyField(source='average_health_score')
+    total_alerts = serializers.ReadOnlyField(source='open_alerts_count')
     owner_name = serializers.CharField(source='owner.username', read_only=True)
     
     class Meta:
@@ -165,15 +316,6 @@ class FarmSerializer(serializers.ModelSerializer):
             'average_health', 'total_alerts', 'owner_name', 'created_at', 'updated_at'
         )
         read_only_fields = ('id', 'created_at', 'updated_at')
-    
-    def get_fields_count(self, obj):
-        return obj.fields_count
-    
-    def get_average_health(self, obj):
-        return obj.average_health_score
-    
-    def get_total_alerts(self, obj):
-        return Alert.objects.filter(field__farm=obj, is_resolved=False).count()
 
 class FarmDetailSerializer(FarmSerializer):
     fields = FieldSerializer(many=True, read_only=True)
@@ -183,12 +325,10 @@ class FarmDetailSerializer(FarmSerializer):
         fields = FarmSerializer.Meta.fields + ('fields', 'recent_alerts')
     
     def get_recent_alerts(self, obj):
-        recent_alerts = Alert.objects.filter(
-            field__farm=obj, is_resolved=False
-        ).order_by('-created_at')[:10]
+        recent_alerts = Alert.active.filter(farm=obj).order_by('-created_at')[:10]
         return AlertSerializer(recent_alerts, many=True).data
 
-class FieldCreateSerializer(serializers.ModelSerializer):
+class FieldCreateSerializer(CachedFieldsModelSerializer):
     """Simplified serializer for field creation"""
     
     class Meta:
@@ -200,20 +340,36 @@ class FieldCreateSerializer(serializers.ModelSerializer):
     
     def validate_area_hectares(self, value):
         if value <= 0:
-            raise serializers.ValidationError("Area must be greater than 0")
-        if value > 10000:  # 10,000 hectares limit
-            raise serializers.ValidationError("Area cannot exceed 10,000 hectares")
+            raise serializers.ValidationError(AREA_POSITIVE_ERROR)
+        if value > MAX_FIELD_AREA_HECTARES:
+            raise serializers.ValidationError(AREA_LIMIT_ERROR)
+        return value
+    
+    def validate_polygon_coordinates(self, value):
+        # Checked on the whole coordinate array at once
+        ring = parse_polygon_ring(value)
+        if ring is None:
+            raise serializers.ValidationError(POLYGON_FORMAT_ERROR)
+        if len(ring) < 4 or not np.array_equal(ring[0], ring[-1]):
+            raise serializers.ValidationError(POLYGON_RING_ERROR)
+        longitudes, latitudes = ring[:, 0], ring[:, 1]
+        if not (
+            np.isfinite(ring).all()
+            and (np.abs(longitudes) <= 180).all()
+            and (np.abs(latitudes) <= 90).all()
+        ):
+            raise serializers.ValidationError(POLYGON_BOUNDS_ERROR)
+        if np.dot(longitudes, np.roll(latitudes, -1)) == np.dot(np.roll(longitudes, -1), latitudes):
+            raise serializers.ValidationError(POLYGON_AREA_ERROR)
         return value
     
     def validate(self, data):
         if data.get('planting_date') and data.get('expected_harvest'):
             if data['planting_date'] >= data['expected_harvest']:
-                raise serializers.ValidationError(
-                    "Expected harvest date must be after planting date"
-                )
+                raise serializers.ValidationError(HARVEST_ORDER_ERROR)
         return data
 
-class CropHealthCreateSerializer(serializers.ModelSerializer):
+class CropHealthCreateSerializer(CachedFieldsModelSerializer):
     """Simplified serializer for crop health data creation"""
     
     class Meta:
@@ -222,9 +378,11 @@ class CropHealthCreateSerializer(serializers.ModelSerializer):
             'field', 'ndvi_value', 'evi_value', 'measured_at', 
             'data_source', 'analysis_notes', 'confidence_level'
         )
+        validators = [
+            UniqueTogetherValidator(CropHealth.objects.all(), ('field', 'data_source', 'measured_at'))
+        ]
     
     def validate_measured_at(self, value):
-        from django.utils import timezone
         if value > timezone.now():
-            raise serializers.ValidationError("Measurement date cannot be in the future")
+            raise serializers.ValidationError(FUTURE_MEASUREMENT_ERROR)
         return value
\ No newline at end of file
@@ -1,8 +1,11 @@
+from django.conf import settings
 from django.urls import path, include
-from rest_framework.routers import DefaultRouter
+from rest_framework.routers import APIRootView, SimpleRouter
 from . import views
 
-router = DefaultRouter()
+# SimpleRouter skips DefaultRouter's root view and the .json format-suffix
+# variant of every route
+router = SimpleRouter()
 router.register(r'farms', views.FarmViewSet)
 router.register(r'fields', views.FieldViewSet)
 router.register(r'crop-health', views.CropHealthViewSet)
@@ -15,4 +18,10 @@ app_name = 'fields'
 
 urlpatterns = [
     path('', include(router.urls)),
-]
\ No newline at end of file
+]
+
+if settings.DEBUG:
+    # Browsable index of the routes above, for people exploring the API
+    urlpatterns.append(path('', APIRootView.as_view(api_root_dict={
+        prefix: f'{basename}-list' for prefix, viewset, basename in router.registry
+    }), name='api-root'))
\ No newline at end of file
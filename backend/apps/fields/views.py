@@ -3,9 +3,12 @@ from rest_framework.decorators import action
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated
 from django_filters.rest_framework import DjangoFilterBackend
+from django.core.cache import cache
 from django.utils import timezone
-from django.db.models import Q, Avg, Count
+from django.db.models import Q, Avg, Count, Prefetch
 from datetime import timedelta, datetime
+from apps.authentication.signals import user_stats_cache_key
+from .alert_rules import evaluate_alerts_for_batch
 from .models import Farm, Field, CropHealth, WeatherData, SoilMoisture, SatelliteImage, Alert
 from .serializers import (
     FarmSerializer, FarmDetailSerializer, FieldSerializer, FieldDetailSerializer,
@@ -14,7 +17,9 @@ from .serializers import (
     AlertSerializer
 )
 from .filters import FieldFilter, CropHealthFilter, AlertFilter
+from .pagination import TimeCursorPagination
 from .permissions import IsOwnerOrReadOnly
+from .signals import FARM_STATS_CACHE_TIMEOUT, farm_stats_cache_key, invalidate_farm_stats
 
 class FarmViewSet(viewsets.ModelViewSet):
     """
@@ -29,7 +34,19 @@ class FarmViewSet(viewsets.ModelViewSet):
     ordering = ['-created_at']
     
     def get_queryset(self):
-        return Farm.objects.filter(owner=self.request.user)
+        queryset = Farm.objects.filter(owner=self.request.user)
+        if self.action == 'alerts':
+            # The farm only scopes the alert listing
+            return queryset.only('id')
+        
+        # owner_name is rendered for every farm
+        queryset = queryset.select_related('owner').with_stats()
+        if self.action == 'retrieve':
+            # FarmDetailSerializer nests the full FieldSerializer per field
+            queryset = queryset.prefetch_related(Prefetch(
+                'fields', queryset=Field.objects.with_latest_readings().with_planting_dates()
+            ))
+        return queryset
     
     def get_serializer_class(self):
         if self.action == 'retrieve':
@@ -45,21 +62,19 @@ class FarmViewSet(viewsets.ModelViewSet):
         Get farm statistics including health metrics and alerts
         """
         farm = self.get_object()
+        cache_key = farm_stats_cache_key(farm.pk)
+        data = cache.get(cache_key)
+        if data is not None:
+            return Response(data)
         
         # Calculate statistics
-        fields_count = farm.fields.count()
+        fields_count = farm.fields_count
         total_area = farm.total_area
         avg_health = farm.average_health_score
         
         # Alert statistics
-        active_alerts = Alert.objects.filter(field__farm=farm, is_resolved=False)
-        alert_stats = {
-            'total': active_alerts.count(),
-            'critical': active_alerts.filter(severity='critical').count(),
-            'high': active_alerts.filter(severity='high').count(),
-            'medium': active_alerts.filter(severity='medium').count(),
-            'low': active_alerts.filter(severity='low').count(),
-        }
+        severity_counts = Alert.active.filter(farm=farm).severity_counts()
+        alert_stats = {'total': sum(severity_counts.values()), **severity_counts}
         
         # Crop type distribution
         crop_distribution = farm.fields.values('crop_type').annotate(
@@ -75,14 +90,16 @@ class FarmViewSet(viewsets.ModelViewSet):
             avg_health=Avg('health_score')
         ).order_by('measured_at__date')
         
-        return Response({
+        data = {
             'fields_count': fields_count,
             'total_area': total_area,
             'average_health': avg_health,
             'alert_statistics': alert_stats,
             'crop_distribution': list(crop_distribution),
             'health_trend': list(health_trend)
-        })
+        }
+        cache.set(cache_key, data, timeout=FARM_STATS_CACHE_TIMEOUT)
+        return Response(data)
     
     @action(detail=True, methods=['get'])
     def alerts(self, request, pk=None):
@@ -90,7 +107,8 @@ class FarmViewSet(viewsets.ModelViewSet):
         Get all alerts for this farm
         """
         farm = self.get_object()
-        alerts = Alert.objects.filter(field__farm=farm)
+        # resolved_by_name is the only related value AlertSerializer renders
+        alerts = Alert.objects.filter(farm=farm).select_related('resolved_by')
         
         # Filter by status
         status_filter = request.query_params.get('status')
@@ -120,9 +138,32 @@ class FieldViewSet(viewsets.ModelViewSet):
     search_fields = ['name', 'crop_type']
     ordering_fields = ['name', 'area_hectares', 'planting_date', 'created_at']
     ordering = ['-created_at']
+    # Detail actions that only use the field to scope a related listing,
+    # and so never render the field's own readings
+    SUBRESOURCE_ACTIONS = {
+        'health_history', 'weather_history', 'add_health_data', 'satellite_images', 'alerts'
+    }
     
     def get_queryset(self):
-        return Field.objects.filter(farm__owner=self.request.user)
+        queryset = Field.objects.filter(farm__owner=self.request.user)
+        if self.action in self.SUBRESOURCE_ACTIONS:
+            # Skip the polygon GeoJSON and the rest of the row; farm_id is
+            # what IsOwnerOrReadOnly checks on add_health_data
+            return queryset.only('id', 'farm_id')
+        
+        queryset = queryset.with_planting_dates()
+        if self.action == 'retrieve':
+            return queryset.full_detail()
+        
+        queryset = queryset.with_latest_readings()
+        if self.action == 'list':
+            # The list serializer never renders the polygon GeoJSON, which
+            # is by far the widest column
+            queryset = queryset.only(
+                'id', 'farm_id', 'name', 'crop_type', 'area_hectares', 'planting_date',
+                'expected_harvest', 'growth_stage', 'is_active', 'created_at', 'updated_at'
+            )
+        return queryset
     
     def get_serializer_class(self):
         if self.action == 'create':
@@ -152,7 +193,7 @@ class FieldViewSet(viewsets.ModelViewSet):
         
         health_data = field.health_data.filter(
             measured_at__gte=start_date
-        ).order_by('measured_at')
+        ).only(*CropHealth.READING_FIELDS).order_by('measured_at')
         
         serializer = CropHealthSerializer(health_data, many=True)
         return Response(serializer.data)
@@ -170,7 +211,7 @@ class FieldViewSet(viewsets.ModelViewSet):
         
         weather_data = field.weather_data.filter(
             weather_date__gte=start_date
-        ).order_by('weather_date')
+        ).only(*WeatherData.READING_FIELDS).with_temperature_avg().order_by('weather_date')
         
         serializer = WeatherDataSerializer(weather_data, many=True)
         return Response(serializer.data)
@@ -187,7 +228,7 @@ class FieldViewSet(viewsets.ModelViewSet):
         
         serializer = CropHealthCreateSerializer(data=data)
         if serializer.is_valid():
-            serializer.save()
+            evaluate_alerts_for_batch([serializer.save()])
             return Response(serializer.data, status=status.HTTP_201_CREATED)
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
     
@@ -220,7 +261,7 @@ class FieldViewSet(viewsets.ModelViewSet):
         Get alerts for a field
         """
         field = self.get_object()
-        alerts = field.alerts.all()
+        alerts = field.alerts.select_related('resolved_by')
         
         # Filter by status
         status_filter = request.query_params.get('status')
@@ -262,8 +303,10 @@ class CropHealthViewSet(viewsets.ModelViewSet):
     permission_classes = [IsAuthenticated]
     filter_backends = [DjangoFilterBackend, filters.OrderingFilter]
     filterset_class = CropHealthFilter
-    ordering_fields = ['measured_at', 'health_score', 'ndvi_value']
+    # The cursor needs a (near) unique sort key, so only the timestamp is orderable
+    ordering_fields = ['measured_at']
     ordering = ['-measured_at']
+    pagination_class = TimeCursorPagination
     
     def get_queryset(self):
         return CropHealth.objects.filter(field__farm__owner=self.request.user)
@@ -273,6 +316,9 @@ class CropHealthViewSet(viewsets.ModelViewSet):
             return CropHealthCreateSerializer
         return CropHealthSerializer
     
+    def perform_create(self, serializer):
+        evaluate_alerts_for_batch([serializer.save()])
+    
     @action(detail=False, methods=['get'])
     def statistics(self, request):
         """
@@ -280,10 +326,13 @@ class CropHealthViewSet(viewsets.ModelViewSet):
         """
         queryset = self.get_queryset()
         
-        # Overall statistics
-        total_measurements = queryset.count()
-        avg_health = queryset.aggregate(avg_health=Avg('health_score'))['avg_health']
-        avg_ndvi = queryset.aggregate(avg_ndvi=Avg('ndvi_value'))['avg_ndvi']
+        # Overall statistics; the count and both averages share one scan
+        totals = queryset.aggregate(
+            total=Count('id'), avg_health=Avg('health_score'), avg_ndvi=Avg('ndvi_value')
+        )
+        total_measurements = totals['total']
+        avg_health = totals['avg_health']
+        avg_ndvi = totals['avg_ndvi']
         
         # Status distribution
         status_distribution = queryset.values('status').annotate(
@@ -312,11 +361,15 @@ class AlertViewSet(viewsets.ModelViewSet):
     permission_classes = [IsAuthenticated]
     filter_backends = [DjangoFilterBackend, filters.OrderingFilter]
     filterset_class = AlertFilter
-    ordering_fields = ['created_at', 'severity']
+    # The cursor needs a (near) unique sort key, so only the timestamp is orderable
+    ordering_fields = ['created_at']
     ordering = ['-created_at']
+    pagination_class = TimeCursorPagination
     
     def get_queryset(self):
-        return Alert.objects.filter(field__farm__owner=self.request.user)
+        # resolved_by_name is rendered for every resolved alert; field and
+        # farm are only serialized as primary keys and need no join
+        return Alert.objects.filter(farm__owner=self.request.user).select_related('resolved_by')
     
     @action(detail=True, methods=['post'])
     def resolve(self, request, pk=None):
@@ -325,6 +378,9 @@ class AlertViewSet(viewsets.ModelViewSet):
         """
         alert = self.get_object()
         alert.resolve(user=request.user)
+        # resolve() is a queryset update, so no post_save reaches the caches
+        invalidate_farm_stats([alert.farm_id])
+        cache.delete(user_stats_cache_key(request.user.id))
         
         serializer = self.get_serializer(alert)
         return Response(serializer.data)
@@ -337,13 +393,8 @@ class AlertViewSet(viewsets.ModelViewSet):
         queryset = self.get_queryset()
         
         # Active alerts by severity
-        active_alerts = queryset.filter(is_resolved=False)
-        severity_stats = {
-            'critical': active_alerts.filter(severity='critical').count(),
-            'high': active_alerts.filter(severity='high').count(),
-            'medium': active_alerts.filter(severity='medium').count(),
-            'low': active_alerts.filter(severity='low').count(),
-        }
+        active_alerts = queryset.unresolved()
+        severity_stats = active_alerts.severity_counts()
         
         # Alert type distribution
         type_distribution = active_alerts.values('alert_type').annotate(
@@ -357,7 +408,7 @@ class AlertViewSet(viewsets.ModelViewSet):
         ).order_by('-created_at')[:10]
         
         return Response({
-            'total_active': active_alerts.count(),
+            'total_active': sum(severity_stats.values()),
             'severity_statistics': severity_stats,
             'type_distribution': list(type_distribution),
             'recent_alerts': AlertSerializer(recent_alerts, many=True).data
@@ -373,9 +424,10 @@ class WeatherDataViewSet(viewsets.ReadOnlyModelViewSet):
     filter_backends = [DjangoFilterBackend, filters.OrderingFilter]
     ordering_fields = ['weather_date']
     ordering = ['-weather_date']
+    pagination_class = TimeCursorPagination
     
     def get_queryset(self):
-        return WeatherData.objects.filter(field__farm__owner=self.request.user)
+        return WeatherData.objects.filter(field__farm__owner=self.request.user).with_temperature_avg()
 
 class SoilMoistureViewSet(viewsets.ReadOnlyModelViewSet):
     """
@@ -387,6 +439,7 @@ class SoilMoistureViewSet(viewsets.ReadOnlyModelViewSet):
     filter_backends = [DjangoFilterBackend, filters.OrderingFilter]
     ordering_fields = ['measured_at']
     ordering = ['-measured_at']
+    pagination_class = TimeCursorPagination
     
     def get_queryset(self):
         return SoilMoisture.objects.filter(field__farm__owner=self.request.user)
@@ -401,6 +454,7 @@ class SatelliteImageViewSet(viewsets.ReadOnlyModelViewSet):
     filter_backends = [DjangoFilterBackend, filters.OrderingFilter]
     ordering_fields = ['captured_at']
     ordering = ['-captured_at']
+    pagination_class = TimeCursorPagination
     
     def get_queryset(self):
         return SatelliteImage.objects.filter(field__farm__owner=self.request.user)
\ No newline at end of file
@@ -1,12 +1,29 @@
+import hashlib
 import requests
+from requests.adapters import HTTPAdapter
 import logging
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
+from urllib.parse import urlencode
+import numpy as np
+import pandas as pd
 from django.conf import settings
+from django.core.cache import cache
 from typing import Dict, List, Optional, Tuple
 import json
 
 logger = logging.getLogger(__name__)
 
+# Shared session so keep-alive connections to the MODIS and Landsat hosts
+# are reused across NASASatelliteAPI instances, with enough pooled
+# connections for the requests made side by side
+_SESSION = requests.Session()
+_SESSION.headers.update({
+    'User-Agent': 'NASA-AgriSat-Platform/1.0',
+    'Accept': 'application/json'
+})
+_SESSION.mount('https://', HTTPAdapter(pool_connections=8, pool_maxsize=8))
+
 class NASASatelliteAPI:
     """
     NASA Satellite API client for fetching MODIS and Landsat data.
@@ -25,12 +42,40 @@ class NASASatelliteAPI:
         'MYD09A1': 'MODIS/Aqua Surface Reflectance 8-Day L3 Global 500m'
     }
     
+    # NDVI products merged by get_modis_ndvi_data, with their satellite
+    NDVI_PRODUCTS = (
+        ('MOD13Q1', 'MODIS_Terra'),
+        ('MYD13Q1', 'MODIS_Aqua'),
+    )
+    NDVI_COLUMNS = ('calendar_date', '_250m_16_days_NDVI', '_250m_16_days_VI_Quality')
+    
+    # Responses are cached by URL and query. Published MODIS and Landsat
+    # granules do not change, and every query carries its end date, so a
+    # range ending today is only reused on the same day.
+    CACHE_TIMEOUT = 7 * 24 * 3600  # 1 week
+    
     def __init__(self):
-        self.session = requests.Session()
-        self.session.headers.update({
-            'User-Agent': 'NASA-AgriSat-Platform/1.0',
-            'Accept': 'application/json'
-        })
+        self.session = _SESSION
+    
+    def _cache_key(self, url: str, params: Dict) -> str:
+        digest = hashlib.blake2b(
+            f"{url}?{urlencode(sorted(params.items()))}".encode(), digest_size=16
+        ).hexdigest()
+        return f"nasa_sat:{digest}"
+    
+    def _get_json(self, url: str, params: Dict):
+        """
+        GET a JSON document, from the Django cache when the same request was
+        made within CACHE_TIMEOUT. Failed requests raise and are not cached.
+        """
+        cache_key = self._cache_key(url, params)
+        data = cache.get(cache_key)
+        if data is None:
+            response = self.session.get(url, params=params, timeout=30)
+            response.raise_for_status()
+            data = response.json()
+            cache.set(cache_key, data, timeout=self.CACHE_TIMEOUT)
+        return data
     
     def search_modis_data(self, latitude: float, longitude: float, 
                          start_date: datetime, end_date: datetime,
@@ -63,10 +108,7 @@ class NASASatelliteAPI:
             logger.info(f"Searching MODIS {product} data for coordinates ({latitude}, {longitude}) "
                        f"from {start_date.date()} to {end_date.date()}")
             
-            response = self.session.get(url, params=params, timeout=30)
-            response.raise_for_status()
-            
-            data = response.json()
+            data = self._get_json(url, params)
             
             if 'subset' in data:
                 return data['subset']
@@ -95,54 +137,18 @@ class NASASatelliteAPI:
             List of NDVI data records
         """
         try:
-            # Search for MOD13Q1 (Terra) data
-            terra_data = self.search_modis_data(latitude, longitude, start_date, end_date, 'MOD13Q1')
-            
-            # Search for MYD13Q1 (Aqua) data
-            aqua_data = self.search_modis_data(latitude, longitude, start_date, end_date, 'MYD13Q1')
+            # Terra and Aqua are independent requests, so fetch them side by side
+            with ThreadPoolExecutor(max_workers=len(self.NDVI_PRODUCTS)) as executor:
+                product_data = list(executor.map(
+                    lambda product: self.search_modis_data(latitude, longitude, start_date, end_date, product[0]),
+                    self.NDVI_PRODUCTS
+                ))
             
             ndvi_records = []
             
-            # Process Terra data
-            if terra_data:
-                for record in terra_data:
-                    if 'calendar_date' in record and '_250m_16_days_NDVI' in record:
-                        try:
-                            date_obj = datetime.strptime(record['calendar_date'], '%Y-%m-%d').date()
-                            ndvi_value = record['_250m_16_days_NDVI']
-                            
-                            # MODIS NDVI values are scaled by 10000
-                            if ndvi_value and ndvi_value != -3000:  # -3000 is no data value
-                                ndvi_records.append({
-                                    'date': date_obj,
-                                    'ndvi_value': ndvi_value / 10000.0,
-                                    'satellite': 'MODIS_Terra',
-                                    'product': 'MOD13Q1',
-                                    'quality': record.get('_250m_16_days_VI_Quality', 0)
-                                })
-                        except (ValueError, TypeError) as e:
-                            logger.warning(f"Error parsing Terra MODIS record: {e}")
-                            continue
-            
-            # Process Aqua data
-            if aqua_data:
-                for record in aqua_data:
-                    if 'calendar_date' in record and '_250m_16_days_NDVI' in record:
-                        try:
-                            date_obj = datetime.strptime(record['calendar_date'], '%Y-%m-%d').date()
-                            ndvi_value = record['_250m_16_days_NDVI']
-                            
-                            if ndvi_value and ndvi_value != -3000:
-                                ndvi_records.append({
-                                    'date': date_obj,
-                                    'ndvi_value': ndvi_value / 10000.0,
-                                    'satellite': 'MODIS_Aqua',
-                                    'product': 'MYD13Q1',
-                                    'quality': record.get('_250m_16_days_VI_Quality', 0)
-                                })
-                        except (ValueError, TypeError) as e:
-                            logger.warning(f"Error parsing Aqua MODIS record: {e}")
-                            continue
+            for (product, satellite), records in zip(self.NDVI_PRODUCTS, product_data):
+                if records:
+                    ndvi_records.extend(self._parse_ndvi_records(records, product, satellite))
             
             # Sort by date
             ndvi_records.sort(key=lambda x: x['date'])
@@ -154,6 +160,38 @@ class NASASatelliteAPI:
             logger.error(f"Error getting MODIS NDVI data: {e}")
             return []
     
+    def _parse_ndvi_records(self, records: List[Dict], product: str, satellite: str) -> List[Dict]:
+        """
+        Turn MODIS subset records into NDVI records in one vectorized pass.
+        Dates and values are parsed column-wise, and no-data or unparseable
+        rows are dropped with a single mask.
+        """
+        frame = pd.DataFrame.from_records(records, columns=self.NDVI_COLUMNS)
+        dates = pd.to_datetime(frame['calendar_date'], format='%Y-%m-%d', errors='coerce')
+        values = pd.to_numeric(frame['_250m_16_days_NDVI'], errors='coerce')
+        quality = pd.to_numeric(frame['_250m_16_days_VI_Quality'], errors='coerce').fillna(0).astype(np.int64)
+        
+        unparsed = int((frame['calendar_date'].notna() & dates.isna()).sum())
+        if unparsed:
+            logger.warning(f"Skipped {unparsed} {satellite} record(s) with an unparseable date")
+        
+        # MODIS NDVI values are scaled by 10000; -3000 is the no data value
+        mask = (dates.notna() & values.notna() & (values != 0) & (values != -3000)).to_numpy()
+        return [
+            {
+                'date': date,
+                'ndvi_value': ndvi_value,
+                'satellite': satellite,
+                'product': product,
+                'quality': quality_flag
+            }
+            for date, ndvi_value, quality_flag in zip(
+                dates[mask].dt.date,
+                (values[mask] / 10000.0).tolist(),
+                quality[mask].tolist()
+            )
+        ]
+    
     def search_landsat_scenes(self, bbox: Tuple[float, float, float, float],
                              start_date: datetime, end_date: datetime,
                              cloud_cover_max: int = 20) -> Optional[List[Dict]]:
@@ -183,10 +221,7 @@ class NASASatelliteAPI:
             logger.info(f"Searching Landsat scenes for bbox {bbox} "
                        f"from {start_date.date()} to {end_date.date()}")
             
-            response = self.session.get(url, params=params, timeout=30)
-            response.raise_for_status()
-            
-            data = response.json()
+            data = self._get_json(url, params)
             
             scenes = []
             if 'feed' in data and 'entry' in data['feed']:
@@ -253,11 +288,13 @@ class NASASatelliteAPI:
             longitude = centroid.x
             bbox = self.calculate_field_bbox(field_boundary)
             
-            # Get MODIS NDVI data
-            modis_data = self.get_modis_ndvi_data(latitude, longitude, start_date, end_date)
-            
-            # Get Landsat scenes
-            landsat_data = self.search_landsat_scenes(bbox, start_date, end_date)
+            # MODIS NDVI and Landsat scenes come from different services,
+            # so fetch them side by side
+            with ThreadPoolExecutor(max_workers=2) as executor:
+                modis_future = executor.submit(self.get_modis_ndvi_data, latitude, longitude, start_date, end_date)
+                landsat_future = executor.submit(self.search_landsat_scenes, bbox, start_date, end_date)
+                modis_data = modis_future.result()
+                landsat_data = landsat_future.result()
             
             return {
                 'modis_ndvi': modis_data,
@@ -1,6 +1,7 @@
 from celery import shared_task
 from django.utils import timezone
 from datetime import datetime, timedelta
+from apps.fields.alert_rules import evaluate_alerts_for_batch
 from apps.fields.models import Field, SatelliteImage, CropHealth
 from .nasa_satellite_api import NASASatelliteAPI
 import logging
@@ -50,34 +51,44 @@ def fetch_satellite_data_for_field(self, field_id, days_back=30, force_update=Fa
         
         # Process MODIS NDVI data
         if 'modis' in data_types and satellite_data.get('modis_ndvi'):
-            modis_count = 0
-            ndvi_count = 0
+            tz = timezone.get_current_timezone()
             
+            # One reading per field, day and source, as update_or_create()
+            # used to keep; a later record for the same day wins
+            readings = {}
             for ndvi_record in satellite_data['modis_ndvi']:
-                try:
-                    # Create or update crop health record with NDVI data
-                    health_data, created = CropHealth.objects.update_or_create(
-                        field=field,
-                        measured_at=datetime.combine(ndvi_record['date'], datetime.min.time()).replace(tzinfo=timezone.get_current_timezone()),
-                        data_source='modis',
-                        defaults={
-                            'ndvi_value': ndvi_record['ndvi_value'],
-                            'status': _calculate_health_status(ndvi_record['ndvi_value']),
-                            'health_score': _calculate_health_score(ndvi_record['ndvi_value']),
-                            'notes': f"MODIS {ndvi_record['satellite']} - {ndvi_record['product']}"
-                        }
-                    )
-                    
-                    if created:
-                        ndvi_count += 1
-                    modis_count += 1
-                    
-                except Exception as e:
-                    logger.warning(f"Error processing MODIS record: {e}")
-                    continue
+                measured_at = datetime.combine(ndvi_record['date'], datetime.min.time()).replace(tzinfo=tz)
+                readings[measured_at] = {
+                    'ndvi_value': ndvi_record['ndvi_value'],
+                    'analysis_notes': f"MODIS {ndvi_record['satellite']} - {ndvi_record['product']}"
+                }
+            
+            # Readings already stored are updated in place with one query
+            existing = list(CropHealth.objects.filter(
+                field=field, data_source='modis', measured_at__in=list(readings)
+            ))
+            for health_data in existing:
+                values = readings[health_data.measured_at]
+                health_data.ndvi_value = values['ndvi_value']
+                health_data.status = _calculate_health_status(values['ndvi_value'])
+                health_data.health_score = _calculate_health_score(values['ndvi_value'])
+                health_data.analysis_notes = values['analysis_notes']
+            CropHealth.objects.bulk_update(existing, ['ndvi_value', 'status', 'health_score', 'analysis_notes'])
+            for health_data in existing:
+                readings.pop(health_data.measured_at, None)
+            
+            # What is left is new; status and health score are derived from
+            # NDVI in one vectorized pass
+            created_health = CropHealth.objects.bulk_ingest([
+                {'field': field, 'measured_at': measured_at, 'data_source': 'modis', **values}
+                for measured_at, values in readings.items()
+            ])
+            
+            # Only the new readings are checked against the health thresholds
+            evaluate_alerts_for_batch(created_health)
             
-            results['modis_processed'] = modis_count
-            results['ndvi_records_created'] = ndvi_count
+            results['modis_processed'] = len(existing) + len(created_health)
+            results['ndvi_records_created'] = len(created_health)
         
         # Process Landsat scenes
         if 'landsat' in data_types and satellite_data.get('landsat_scenes'):
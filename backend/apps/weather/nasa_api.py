@@ -1,11 +1,21 @@
 import requests
 import logging
-from datetime import datetime, timedelta
+from datetime import date, datetime, timedelta
 from django.conf import settings
 from typing import Dict, List, Optional, Tuple
 
 logger = logging.getLogger(__name__)
 
+def _parse_power_date(date_str: str) -> date:
+    """
+    Parse a NASA POWER YYYYMMDD date key. Slicing the digits is much cheaper
+    than datetime.strptime(), which matters when parsing every day of a
+    multi-year range. Malformed keys raise ValueError, as strptime would.
+    """
+    if len(date_str) != 8 or not date_str.isdigit():
+        raise ValueError(f"expected a YYYYMMDD date, got {date_str!r}")
+    return date(int(date_str[:4]), int(date_str[4:6]), int(date_str[6:]))
+
 class NASAPowerAPI:
     """
     NASA POWER API client for fetching weather and solar data.
@@ -100,7 +110,7 @@ class NASAPowerAPI:
             
             for date_str in dates:
                 try:
-                    date_obj = datetime.strptime(date_str, '%Y%m%d').date()
+                    date_obj = _parse_power_date(date_str)
                     
                     record = {
                         'weather_date': date_obj,
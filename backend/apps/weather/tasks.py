@@ -2,6 +2,7 @@ from celery import shared_task
 from django.utils import timezone
 from datetime import datetime, timedelta
 from django.contrib.auth.models import User
+from apps.fields.alert_rules import evaluate_alerts_for_batch
 from apps.fields.models import Field, WeatherData
 from .nasa_api import NASAPowerAPI
 import logging
@@ -55,7 +56,7 @@ def fetch_weather_for_field(self, field_id, days_back=7, force_update=False):
         
         # Parse and save weather data
         weather_records = nasa_api.parse_weather_data(api_data)
-        created_count = 0
+        created_records = []
         updated_count = 0
         
         for record in weather_records:
@@ -75,10 +76,14 @@ def fetch_weather_for_field(self, field_id, days_back=7, force_update=False):
             )
             
             if created:
-                created_count += 1
+                created_records.append(weather_data)
             else:
                 updated_count += 1
         
+        # Check the new days against the weather thresholds in one pass
+        evaluate_alerts_for_batch(created_records)
+        created_count = len(created_records)
+        
         logger.info(f"Weather data fetch completed for field {field_id}: "
                    f"{created_count} created, {updated_count} updated")
         
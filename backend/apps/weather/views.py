@@ -48,7 +48,7 @@ def get_field_weather(request, field_id):
         start_date = end_date - timedelta(days=days)
         weather_query &= Q(weather_date__range=[start_date, end_date])
     
-    weather_data = WeatherData.objects.filter(weather_query).order_by('-weather_date')
+    weather_data = WeatherData.objects.filter(weather_query).with_temperature_avg().order_by('-weather_date')
     serializer = WeatherDataSerializer(weather_data, many=True)
     
     return Response({
@@ -145,7 +145,7 @@ def get_weather_summary(request, field_id):
     recent_weather = WeatherData.objects.filter(
         field=field,
         weather_date__gte=end_date - timedelta(days=7)
-    ).order_by('-weather_date')[:7]
+    ).with_temperature_avg().order_by('-weather_date')[:7]
     
     recent_serializer = WeatherDataSerializer(recent_weather, many=True)
     